@@ -0,0 +1,50 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The animation module for the Dragonfire game. Sprites describe their animations as frame tables, and an Animation advances through the current table by index once per tick.
+'''
+
+
+class Animation:
+    '''This class plays back frame tables. Each table maps a state name to a sequence of (frame name, duration in ticks) pairs.'''
+    def __init__(self, frames, tables, state):
+        '''This initializer takes a dictionary of frame Surfaces, the frame tables, and the starting state.'''
+        # Resolve the frame names once so advancing never has to look them up
+        self.tables = {}
+        for name, table in tables.items():
+            self.tables[name] = tuple((frames[frameName], duration) for frameName, duration in table)
+
+        # Instance variables
+        self.state = state
+        self.table = self.tables[state]
+        self.index = 0
+        self.ticks = 0
+        self.cycles = 0
+        self.image = self.table[0][0]
+
+    def setState(self, state):
+        '''This method switches to the given state and restarts it from its first frame. Switching to the current state does nothing.'''
+        if state != self.state:
+            self.restart(state)
+
+    def restart(self, state):
+        '''This method switches to the given state and starts it from its first frame, even if it is the current state.'''
+        self.state = state
+        self.table = self.tables[state]
+        self.index = 0
+        self.ticks = 0
+        self.cycles = 0
+        self.image = self.table[0][0]
+
+    def advance(self):
+        '''This method advances the animation by one tick and returns the frame to display.'''
+        self.ticks += 1
+        if self.ticks >= self.table[self.index][1]:
+            self.ticks = 0
+            self.index += 1
+            if self.index == len(self.table):
+                self.index = 0
+                self.cycles += 1
+            self.image = self.table[self.index][0]
+        return self.image
@@ -0,0 +1,238 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The asset bundle module for the Dragonfire game. Running this module packs every image in myImages/ as raw pixels in the display's pixel format and every sound effect in soundEffects/ as decoded PCM into a single bundle file. At runtime the bundle is memory-mapped and Surfaces are built directly on top of the mapped pixels, so nothing has to be decoded before the first frame. Run it with "report" to compare startup time against loading the loose files.
+'''
+
+import pygame, json, mmap, os, struct, sys, time
+
+# The bundle file written by the packer
+BUNDLE_FILE = "assets.bundle"
+
+# File signature and header layout: signature, then the length of the JSON index
+SIGNATURE = b"DFBUNDL1"
+HEADER = struct.Struct("<8sI")
+
+# Every block of data starts on a multiple of this many bytes
+ALIGNMENT = 64
+
+# The music is streamed by pygame.mixer.music and is left out of the bundle
+STREAMED_SOUNDS = ("soundEffects/backgroundMusic.ogg",)
+
+
+def bundleKey(fileName):
+    '''This function returns the name an asset is stored under. Names are case-insensitive, like the file system the game was written on.'''
+    return fileName.replace("\\", "/").lower()
+
+
+def sourceStamp(path):
+    '''This function returns the [size, modification time in nanoseconds] of a source file, which changes whenever the file is edited or rebuilt, or None if the file is gone.'''
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def pixelFormat(surface):
+    '''This function returns the pygame byte order string matching the given 32-bit Surface, or None if it cannot be used for a bundle.'''
+    if surface.get_bitsize() != 32:
+        return None
+    masks = surface.get_masks()[:3]
+    if sys.byteorder == "little":
+        if masks == (0xFF0000, 0xFF00, 0xFF):
+            return "BGRA"
+        if masks == (0xFF, 0xFF00, 0xFF0000):
+            return "RGBA"
+    else:
+        if masks == (0xFF000000, 0xFF0000, 0xFF00):
+            return "RGBA"
+    return None
+
+
+class AssetBundle:
+    '''This class defines a memory-mapped asset bundle that builds Surfaces and Sounds from the mapped data.'''
+    def __init__(self, fileName):
+        '''This initializer takes the bundle file name, maps the file into memory and reads its index.'''
+        bundleFile = open(fileName, "rb")
+        # Map copy-on-write so a Surface that is accidentally drawn on cannot write to the file
+        self.data = mmap.mmap(bundleFile.fileno(), 0, access=mmap.ACCESS_COPY)
+        bundleFile.close()
+        self.view = memoryview(self.data)
+
+        signature, indexLength = HEADER.unpack_from(self.data, 0)
+        if signature != SIGNATURE:
+            raise ValueError("%s is not a Dragonfire asset bundle" % fileName)
+        index = json.loads(bytes(self.view[HEADER.size:HEADER.size + indexLength]))
+
+        # Instance variables
+        self.format = index["format"]
+        self.masks = tuple(index["masks"])
+        self.mixer = tuple(index["mixer"])
+        self.images = index["images"]
+        self.sounds = index["sounds"]
+        self.dropped = []
+
+        # Only use the parts of the bundle that match the current display and mixer
+        display = pygame.display.get_surface()
+        if display is None or pixelFormat(display) != self.format or display.get_masks()[:3] != self.masks[:3]:
+            self.images = {}
+        if pygame.mixer.get_init() != self.mixer:
+            self.sounds = {}
+
+        # Drop the assets whose source file has changed since the bundle was packed, so an edited image is loaded from the loose file instead. A bundle without stamps can not be checked at all.
+        sources = index.get("sources", {})
+        for entries in (self.images, self.sounds):
+            for name in list(entries):
+                source = sources.get(name)
+                if source is None or sourceStamp(source[0]) != source[1:]:
+                    del entries[name]
+                    self.dropped.append(name)
+
+    def hasImage(self, fileName):
+        '''This method returns True if the bundle holds usable pixels for the given image file.'''
+        return bundleKey(fileName) in self.images
+
+    def hasSound(self, fileName):
+        '''This method returns True if the bundle holds usable samples for the given sound file.'''
+        return bundleKey(fileName) in self.sounds
+
+    def loadImage(self, fileName):
+        '''This method returns a Surface that shares its pixels with the mapped bundle.'''
+        offset, width, height = self.images[bundleKey(fileName)]
+        pixels = self.view[offset:offset + width * height * 4]
+        image = pygame.image.frombuffer(pixels, (width, height), self.format)
+        # The packed pixels are opaque, so blit them without per-pixel alpha like a converted image
+        image.set_alpha(None)
+        return image
+
+    def loadSound(self, fileName):
+        '''This method returns a Sound built from the decoded samples in the bundle. The mixer keeps its own copy of the samples.'''
+        offset, length = self.sounds[bundleKey(fileName)]
+        return pygame.mixer.Sound(buffer=self.view[offset:offset + length])
+
+
+def openBundle(fileName=BUNDLE_FILE):
+    '''This function returns the AssetBundle for the given file, or None if there is no bundle to use.'''
+    if not os.path.exists(fileName):
+        return None
+    return AssetBundle(fileName)
+
+
+def packBundle(fileName=BUNDLE_FILE):
+    '''This function decodes every image and sound effect and writes them into a bundle file. The display and mixer must already be initialized with the settings the game uses.'''
+    display = pygame.display.get_surface()
+    byteOrder = pixelFormat(display)
+    if byteOrder is None:
+        raise ValueError("The display pixel format can not be stored in a bundle")
+
+    blocks = []
+    images = {}
+    sounds = {}
+    sources = {}
+    for name in sorted(os.listdir("myImages")):
+        if os.path.splitext(name)[1].lower() not in (".png", ".jpg"):
+            continue
+        path = "myImages/" + name
+        image = pygame.image.load(path).convert()
+        images[bundleKey(path)] = [len(blocks), image.get_width(), image.get_height()]
+        sources[bundleKey(path)] = [path] + sourceStamp(path)
+        blocks.append(pygame.image.tobytes(image, byteOrder))
+    for name in sorted(os.listdir("soundEffects")):
+        path = "soundEffects/" + name
+        if path in STREAMED_SOUNDS:
+            continue
+        samples = pygame.mixer.Sound(path).get_raw()
+        sounds[bundleKey(path)] = [len(blocks), len(samples)]
+        sources[bundleKey(path)] = [path] + sourceStamp(path)
+        blocks.append(samples)
+
+    # Work out where every block goes. The index holds offsets, so lay it out with a size estimate and repeat until it fits.
+    indexSpace = ALIGNMENT
+    while True:
+        offsets = []
+        offset = HEADER.size + indexSpace
+        for block in blocks:
+            offset += -offset % ALIGNMENT
+            offsets.append(offset)
+            offset += len(block)
+        index = {
+            "format": byteOrder,
+            "masks": list(display.get_masks()),
+            "mixer": list(pygame.mixer.get_init()),
+            "images": dict((name, [offsets[entry[0]]] + entry[1:]) for name, entry in images.items()),
+            "sounds": dict((name, [offsets[entry[0]]] + entry[1:]) for name, entry in sounds.items()),
+            "sources": sources
+        }
+        indexBytes = json.dumps(index).encode("utf-8")
+        if len(indexBytes) <= indexSpace:
+            break
+        indexSpace = len(indexBytes) + -len(indexBytes) % ALIGNMENT
+
+    bundleFile = open(fileName, "wb")
+    bundleFile.write(HEADER.pack(SIGNATURE, len(indexBytes)))
+    bundleFile.write(indexBytes.ljust(indexSpace, b"\0"))
+    for offset, block in zip(offsets, blocks):
+        bundleFile.write(b"\0" * (offset - bundleFile.tell()))
+        bundleFile.write(block)
+    size = bundleFile.tell()
+    bundleFile.close()
+    print("Packed %d images and %d sounds into %s (%d KB)" % (len(images), len(sounds), fileName, size // 1024))
+
+
+def loadLooseFiles():
+    '''This function loads every asset the bundle would hold from the loose files and returns them.'''
+    assets = []
+    for name in sorted(os.listdir("myImages")):
+        if os.path.splitext(name)[1].lower() in (".png", ".jpg"):
+            assets.append(pygame.image.load("myImages/" + name).convert())
+    for name in sorted(os.listdir("soundEffects")):
+        if "soundEffects/" + name not in STREAMED_SOUNDS:
+            assets.append(pygame.mixer.Sound("soundEffects/" + name))
+    return assets
+
+
+def loadBundledFiles(fileName=BUNDLE_FILE):
+    '''This function opens the bundle and builds every asset it holds, then returns them.'''
+    bundle = AssetBundle(fileName)
+    assets = [bundle.loadImage(name) for name in bundle.images]
+    assets += [bundle.loadSound(name) for name in bundle.sounds]
+    return assets
+
+
+def printStartupReport(repeats=10, fileName=BUNDLE_FILE):
+    '''This function times loading every asset from the loose files and from the bundle and prints the comparison.'''
+    results = []
+    for mode, loader in (("loose files", loadLooseFiles), ("bundle", lambda: loadBundledFiles(fileName))):
+        times = []
+        for repeat in range(repeats):
+            start = time.perf_counter()
+            assets = loader()
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        results.append((mode, len(assets), times[0], times[len(times) // 2]))
+
+    print("%-12s %7s %9s %11s" % ("mode", "assets", "best ms", "median ms"))
+    for mode, count, best, median in results:
+        print("%-12s %7d %9.2f %11.2f" % (mode, count, best, median))
+    print("Bundle speedup: %.1fx" % (results[0][3] / results[1][3]))
+
+    # Assets left out of the bundle are loaded from the loose files, which the timings above do not show
+    dropped = AssetBundle(fileName).dropped
+    if dropped:
+        print("%d stale bundle entries were dropped and load from the loose files: %s" % (len(dropped), ", ".join(sorted(dropped))))
+        print("Run assetBundle.py again to repack them")
+
+
+if __name__ == "__main__":
+    # Use the same display and mixer settings as the game so the packed formats match
+    pygame.init()
+    pygame.mixer.init()
+    pygame.display.set_mode((640, 480))
+    if "report" in sys.argv[1:]:
+        if not os.path.exists(BUNDLE_FILE):
+            packBundle()
+        printStartupReport()
+    else:
+        packBundle()
@@ -0,0 +1,98 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The asset cache module for the Dragonfire game. Every image, sound and font is loaded only once, from the asset bundle if one is open, from the preloader if it is decoding the file, or from the loose files otherwise, and the same object is handed out to everything that asks for it afterwards.
+'''
+
+import pygame
+
+# Converted Surfaces keyed by the file name they were loaded from
+images = {}
+
+# Sounds keyed by the file name they were loaded from
+sounds = {}
+
+# Fonts keyed by (file name, size)
+fonts = {}
+
+# The memory-mapped AssetBundle to load from before falling back to the loose files, if any
+bundle = None
+
+# The Preloader decoding assets in the background, if any
+preloader = None
+
+# Cache counters
+hits = 0
+misses = 0
+
+
+def loadImage(fileName):
+    '''This function returns the converted Surface for the given file name, loading it from disk only the first time it is requested.'''
+    global hits, misses
+
+    image = images.get(fileName)
+    if image is not None:
+        hits += 1
+        return image
+
+    # Decode and convert the image the first time it is requested
+    misses += 1
+    if bundle is not None and bundle.hasImage(fileName):
+        image = bundle.loadImage(fileName)
+    elif preloader is not None and preloader.has(fileName):
+        image = preloader.wait(fileName).convert()
+    else:
+        image = pygame.image.load(fileName).convert()
+    images[fileName] = image
+    return image
+
+
+def loadSound(fileName):
+    '''This function returns the Sound for the given file name, decoding it only the first time it is requested.'''
+    global hits, misses
+
+    sound = sounds.get(fileName)
+    if sound is not None:
+        hits += 1
+        return sound
+
+    misses += 1
+    if bundle is not None and bundle.hasSound(fileName):
+        sound = bundle.loadSound(fileName)
+    elif preloader is not None and preloader.has(fileName):
+        sound = preloader.wait(fileName)
+    else:
+        sound = pygame.mixer.Sound(fileName)
+    sounds[fileName] = sound
+    return sound
+
+
+def loadFont(fileName, size):
+    '''This function returns the Font for the given file name and size, opening the file only the first time it is requested.'''
+    global hits, misses
+
+    font = fonts.get((fileName, size))
+    if font is not None:
+        hits += 1
+        return font
+
+    misses += 1
+    font = pygame.font.Font(fileName, size)
+    fonts[(fileName, size)] = font
+    return font
+
+
+def getStats():
+    '''This function returns a dictionary with the number of cache hits, misses and cached images.'''
+    return {"hits": hits, "misses": misses, "images": len(images), "sounds": len(sounds), "fonts": len(fonts)}
+
+
+def clear():
+    '''This function empties the cache and resets the counters, e.g. after the display mode has been changed.'''
+    global hits, misses
+    images.clear()
+    sounds.clear()
+    fonts.clear()
+    hits = 0
+    misses = 0
@@ -0,0 +1,110 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The sprite-sheet atlas module for the Dragonfire game. Running this module packs the animation frames of each character into a single sheet with an index, and the game loads every character from its sheet with a single decode.
+'''
+
+import pygame, json, os, assetCache
+
+# The index file written by the build step
+INDEX_FILE = "myImages/atlas.json"
+
+# Gap left between frames on a sheet
+PADDING = 1
+
+# Animation frames of every character, in the order they are packed onto the sheet
+CHARACTERS = {
+    "player": ("playerLeft1", "playerLeft2", "playerRight1", "playerRight2", "playerLeftCrouched", "playerRightCrouched"),
+    "dragon": ("dragonLeft1", "dragonLeft2", "dragonLeft3", "dragonRight1", "dragonRight2", "dragonRight3", "dragonLeftShoot", "dragonRightShoot"),
+    "fireball": ("sideFireball1", "sideFireball2", "upFireball1", "upFireball2")
+}
+
+# Frame dictionaries that have already been built, keyed by character
+loadedFrames = {}
+
+# The index read from INDEX_FILE, or None if it has not been read yet
+atlasIndex = None
+
+
+def findFrameFile(frameName):
+    '''This function returns the path of the loose image file for the given frame name.'''
+    for fileName in os.listdir("myImages"):
+        if os.path.splitext(fileName)[0] == frameName:
+            return "myImages/" + fileName
+    raise FileNotFoundError("No image found for frame %s" % frameName)
+
+
+def readIndex():
+    '''This function reads the atlas index once and returns it, or an empty dictionary if the atlas has not been built.'''
+    global atlasIndex
+    if atlasIndex is None:
+        if os.path.exists(INDEX_FILE):
+            indexFile = open(INDEX_FILE, "r")
+            atlasIndex = json.load(indexFile)
+            indexFile.close()
+        else:
+            atlasIndex = {}
+    return atlasIndex
+
+
+def loadFrames(character):
+    '''This function returns a dictionary of frame Surfaces keyed by frame name for the given character. The frames are subsurfaces of the character's sheet, or the loose images if the atlas has not been built.'''
+    frames = loadedFrames.get(character)
+    if frames is not None:
+        return frames
+
+    entry = readIndex().get(character)
+    frames = {}
+    if entry is not None:
+        # Cut every frame out of the sheet that was decoded once
+        sheet = assetCache.loadImage(entry["sheet"])
+        for frameName, frameRect in entry["frames"].items():
+            frames[frameName] = sheet.subsurface(pygame.Rect(frameRect))
+    else:
+        for frameName in CHARACTERS[character]:
+            frames[frameName] = assetCache.loadImage(findFrameFile(frameName))
+
+    loadedFrames[character] = frames
+    return frames
+
+
+def imageFiles(character):
+    '''This function returns the image files loadFrames() loads for the given character.'''
+    entry = readIndex().get(character)
+    if entry is not None:
+        return [entry["sheet"]]
+    return [findFrameFile(frameName) for frameName in CHARACTERS[character]]
+
+
+def buildAtlas():
+    '''This function packs the frames of every character into one sheet per character and writes the index describing where every frame is.'''
+    index = {}
+    for character, frameNames in CHARACTERS.items():
+        images = [pygame.image.load(findFrameFile(frameName)) for frameName in frameNames]
+
+        # Pack the frames side by side in a single row
+        width = sum(image.get_width() for image in images) + PADDING * (len(images) - 1)
+        height = max(image.get_height() for image in images)
+        sheet = pygame.Surface((width, height))
+        sheet.fill((0, 0, 0))
+
+        frames = {}
+        left = 0
+        for frameName, image in zip(frameNames, images):
+            sheet.blit(image, (left, 0))
+            frames[frameName] = [left, 0, image.get_width(), image.get_height()]
+            left += image.get_width() + PADDING
+
+        sheetFile = "myImages/%sSheet.png" % character
+        pygame.image.save(sheet, sheetFile)
+        index[character] = {"sheet": sheetFile, "frames": frames}
+        print("Packed %d frames into %s (%dx%d)" % (len(images), sheetFile, width, height))
+
+    indexFile = open(INDEX_FILE, "w")
+    json.dump(index, indexFile, indent=4)
+    indexFile.close()
+
+
+if __name__ == "__main__":
+    buildAtlas()
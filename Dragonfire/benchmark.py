@@ -0,0 +1,209 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The benchmark module for the Dragonfire game. Each named scenario runs headless for a fixed number of frames, drawing to the dummy screen, and reports the mean, p50, p95, and p99 frame time, the memory allocated while it ran, and the peak resident set size of its process. Results are written as JSON and can be compared against a saved baseline. Every scenario runs in a fresh process so their memory numbers do not mix.
+'''
+
+import pygame, argparse, gc, json, multiprocessing, random, sys, time, tracemalloc, bots, entityRegistry, headless, inputSource, runtime, stages
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Frames each scenario runs for unless told otherwise
+DEFAULT_FRAMES = 600
+
+# Lives the player starts each repeated stage with
+LIVES = 7
+
+# Fireballs kept alive in the fireball flood scenario
+FLOOD_FIREBALLS = 300
+
+# A metric this much slower than the baseline counts as a regression
+DEFAULT_TOLERANCE = 0.10
+
+# Metrics compared against the baseline, where higher is worse for all of them
+COMPARED_METRICS = ("mean", "p50", "p95", "p99")
+
+
+class RepeatedStage:
+    '''This class defines a stand-in for a Game that plays one stage at a fixed level over and over, so a scenario never leaves it.'''
+    def __init__(self, runtime, stageNumber, level):
+        '''This initializer takes the Runtime, the stage to play, and the level of difficulty, and starts the stage.'''
+        self.runtime = runtime
+        self.stageNumber = stageNumber
+        self.level = level
+        self.endGame = False
+        self.frames = 0
+        if stageNumber == 1:
+            self.stage = stages.StageOne(runtime, 0, LIVES)
+        else:
+            self.stage = stages.StageTwo(runtime, 0, LIVES)
+        self.restart()
+
+    def restart(self):
+        '''This method starts the stage again from the beginning.'''
+        self.runtime.fireballs.releaseAll()
+        self.stage.enter(0, LIVES, self.level)
+
+    def step(self):
+        '''This method runs and renders one tick of the stage, restarting it first if it has ended.'''
+        if not self.stage.keepGoing:
+            self.restart()
+        self.runtime.sounds.beginFrame()
+        events, keysPressed = self.runtime.input.poll(self)
+        self.stage.step(events, keysPressed)
+        self.frames += 1
+
+
+def floodFireballs(game):
+    '''This function tops the fireballs up to FLOOD_FIREBALLS, spread over the sky above the drawbridge so they keep flying.'''
+    fireballs = game.runtime.fireballs
+    while fireballs.getStats()["active"] < FLOOD_FIREBALLS:
+        row = fireballs.spawns % 240
+        fireballs.spawn(1, ((0, 20 + row), (620, 20 + row)), 0)
+
+
+def endStage(game):
+    '''This function ends the current stage after every tick, so every frame of a Game is a stage transition.'''
+    game.stage.keepGoing = False
+
+
+# Scenarios: the game to run, the bot that plays it, the fireball cap, and a function called before every frame
+SCENARIOS = {
+    "stage1-level0": (lambda gameRuntime: RepeatedStage(gameRuntime, 1, 0), bots.playerBot, runtime.FIREBALL_CAP, None),
+    "stage1-level20": (lambda gameRuntime: RepeatedStage(gameRuntime, 1, 20), bots.playerBot, runtime.FIREBALL_CAP, None),
+    "stage2-all-treasures": (lambda gameRuntime: RepeatedStage(gameRuntime, 2, 0), bots.playerBot, runtime.FIREBALL_CAP, None),
+    "fireball-flood": (lambda gameRuntime: RepeatedStage(gameRuntime, 1, 0), bots.idleBot, FLOOD_FIREBALLS, floodFireballs),
+    "stage-churn": (lambda gameRuntime: stages.Game(gameRuntime, 0, LIVES), bots.idleBot, runtime.FIREBALL_CAP, endStage)
+}
+
+
+def percentile(sortedValues, fraction):
+    '''This function returns the value at the given fraction of a sorted list, using the nearest rank.'''
+    index = min(len(sortedValues) - 1, max(0, int(round(fraction * len(sortedValues))) - 1))
+    return sortedValues[index]
+
+
+def peakResidentKiB():
+    '''This function returns the peak resident set size of this process in KiB, or None where the resource module is not available.'''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak
+
+
+def playScenario(name, frames, engine, seed, trace):
+    '''This function runs a scenario for the given number of frames and returns the milliseconds each frame took. If trace is True, tracemalloc follows the allocations and the frame times are not meaningful.'''
+    createGame, policy, fireballCap, beforeFrame = SCENARIOS[name]
+
+    # Free the sprites of an earlier run, which hold references to each other
+    gc.collect()
+    random.seed(seed)
+    entityRegistry.setThreshold("Fireball", max(entityRegistry.DEFAULT_THRESHOLD, fireballCap))
+    gameRuntime = headless.createRuntime(inputSource.ScriptedInput(policy), engine, True, fireballCap)
+    game = createGame(gameRuntime)
+
+    times = []
+    if trace:
+        tracemalloc.start()
+    for frame in range(frames):
+        start = time.perf_counter()
+        if beforeFrame is not None:
+            beforeFrame(game)
+        game.step()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def runScenario(name, frames, engine="pool", seed=0):
+    '''This function runs a scenario once for timing and once under tracemalloc, and returns a dictionary of its results.'''
+    times = sorted(playScenario(name, frames, engine, seed, False))
+    playScenario(name, frames, engine, seed, True)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "frames": frames,
+        "mean": sum(times) / len(times),
+        "p50": percentile(times, 0.50),
+        "p95": percentile(times, 0.95),
+        "p99": percentile(times, 0.99),
+        "max": times[-1],
+        "retainedKiB": current / 1024,
+        "allocatedPeakKiB": peak / 1024,
+        "peakRssKiB": peakResidentKiB()
+    }
+
+
+def runAll(names, frames, engine="pool", seed=0):
+    '''This function runs each of the named scenarios in a fresh process and returns a dictionary of their results.'''
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in names:
+        pool = context.Pool(1)
+        results[name] = pool.apply(runScenario, (name, frames, engine, seed))
+        pool.close()
+        pool.join()
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    '''This function prints each metric next to its baseline and returns a list of the (scenario, metric) pairs that got slower by more than the tolerance.'''
+    regressions = []
+    print("%-22s %-6s %10s %10s %8s" % ("scenario", "metric", "baseline", "current", "change"))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in COMPARED_METRICS:
+            before = baseline[name][metric]
+            after = result[metric]
+            change = (after - before) / before if before else 0.0
+            flag = ""
+            if change > tolerance:
+                regressions.append((name, metric))
+                flag = " slower"
+            print("%-22s %-6s %10.3f %10.3f %+7.1f%%%s" % (name, metric, before, after, change * 100, flag))
+    return regressions
+
+
+def main():
+    '''This function runs the benchmarks from the command line.'''
+    parser = argparse.ArgumentParser(description="Run the Dragonfire benchmark scenarios.")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help="scenarios to run (default: all of them)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames each scenario runs for")
+    parser.add_argument("--engine", default="pool", choices=("pool", "array"), help="fireball engine")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the game's random numbers")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="fraction slower than the baseline that counts as a regression")
+    arguments = parser.parse_args()
+
+    for name in arguments.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario %s, choose from %s" % (name, ", ".join(SCENARIOS)))
+
+    results = runAll(arguments.scenarios, arguments.frames, arguments.engine, arguments.seed)
+    report = {"engine": arguments.engine, "seed": arguments.seed, "pygame": pygame.version.ver, "python": sys.version.split()[0], "scenarios": results}
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        outputFile = open(arguments.output, "w")
+        outputFile.write(text + "\n")
+        outputFile.close()
+    else:
+        print(text)
+
+    if arguments.baseline:
+        baselineFile = open(arguments.baseline, "r")
+        baseline = json.load(baselineFile)["scenarios"]
+        baselineFile.close()
+        if compare(results, baseline, arguments.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The bots module for the Dragonfire game. A bot is a policy for a ScriptedInput: it is called every tick with the Game and returns the keys to hold. The bots play well enough to reach every part of both stages, which makes them useful for benchmarks and balance sweeps.
+'''
+
+import pygame
+
+# Distances in pixels at which the player bot reacts to an incoming fireball
+CROUCH_DISTANCE = 60
+JUMP_DISTANCE = 25
+
+# Fireballs above this line fly at head height and are crouched under, the rest are jumped over
+HEAD_HEIGHT = 280
+
+
+def idleBot(game):
+    '''This function is a bot that never presses anything, so the player stays hidden in the spawn portal.'''
+    return ()
+
+
+def playerBot(game):
+    '''This function is a bot that crosses the drawbridge while dodging fireballs, then collects every treasure and heads for the end portal.'''
+    stage = game.stage
+    player = stage.player
+
+    # Press left every other tick to step out of the spawn portal
+    if not stage.allSprites.isVisible(player):
+        if game.frames % 2:
+            return (pygame.K_LEFT,)
+        return ()
+
+    if game.stageNumber == 1:
+        keys = {pygame.K_LEFT}
+        for left, top in game.runtime.fireballs.positions():
+            distance = player.rect.left - left - 40
+            if top < HEAD_HEIGHT and -40 < distance < CROUCH_DISTANCE:
+                keys = {pygame.K_DOWN}
+            if top >= HEAD_HEIGHT and 0 < distance < JUMP_DISTANCE:
+                keys.add(pygame.K_UP)
+        return keys
+
+    # Head for the nearest treasure, or the end portal once they are all collected
+    treasures = [treasure for treasure in stage.treasures if treasure.alive()]
+    if treasures:
+        target = min(treasures, key=lambda treasure: abs(treasure.rect.centerx - player.rect.centerx) + abs(treasure.rect.centery - player.rect.centery)).rect
+    else:
+        target = stage.endPortal.rect
+    keys = set()
+    if target.centerx < player.rect.centerx - 8:
+        keys.add(pygame.K_LEFT)
+    elif target.centerx > player.rect.centerx + 8:
+        keys.add(pygame.K_RIGHT)
+    if target.centery < player.rect.centery - 8:
+        keys.add(pygame.K_UP)
+    elif target.centery > player.rect.centery + 8:
+        keys.add(pygame.K_DOWN)
+    return keys
@@ -0,0 +1,147 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The collision module for the Dragonfire game. A SpatialHash is a sprite group that buckets its sprites into a uniform grid over the playfield, so a collision query only looks at sprites near the one being tested. Candidates are then checked against masks of the visible pixels, which are built once per animation frame.
+'''
+
+import pygame
+
+# Size of the playfield covered by the grid
+PLAYFIELD_WIDTH = 640
+PLAYFIELD_HEIGHT = 480
+
+# Pixels this close to black are the background of a sprite image
+BACKGROUND_THRESHOLD = (16, 16, 16, 255)
+
+# Masks of the visible pixels, keyed by the image Surface they were built from
+masks = {}
+
+
+def getMask(image):
+    '''This function returns the mask of the visible pixels in the given image, building it the first time the image is seen.'''
+    mask = masks.get(image)
+    if mask is None:
+        # The images have no colorkey, so treat the near-black surroundings as empty
+        mask = pygame.mask.from_threshold(image, (0, 0, 0), BACKGROUND_THRESHOLD)
+        mask.invert()
+        masks[image] = mask
+    return mask
+
+
+def precomputeMasks(images):
+    '''This function builds the masks of every given image ahead of time, e.g. every frame of a character.'''
+    for image in images:
+        getMask(image)
+
+
+def masksOverlap(imageA, positionA, imageB, positionB):
+    '''This function returns True if the visible pixels of two images drawn at the given positions overlap.'''
+    offset = (int(positionB[0] - positionA[0]), int(positionB[1] - positionA[1]))
+    return getMask(imageA).overlap(getMask(imageB), offset) is not None
+
+
+class SpatialHash(pygame.sprite.AbstractGroup):
+    '''This class defines a sprite group that keeps its sprites in a uniform grid of cells. Killing a sprite removes it from the grid like from any other group.'''
+    def __init__(self, cellSize=64, width=PLAYFIELD_WIDTH, height=PLAYFIELD_HEIGHT):
+        '''This initializer takes the size of a grid cell and of the playfield in pixels.'''
+        # Call the parent __init__() method
+        pygame.sprite.AbstractGroup.__init__(self)
+
+        self.cellSize = cellSize
+        self.columns = (width + cellSize - 1) // cellSize
+        self.rows = (height + cellSize - 1) // cellSize
+        self.cells = {}
+
+        # The cell range (left, top, right, bottom) each sprite is bucketed in
+        self.spriteCells = {}
+
+        # Counters for the current frame, and the totals of the last finished frame
+        self.queries = 0
+        self.candidates = 0
+        self.narrowTests = 0
+        self.rebuckets = 0
+        self.lastFrame = {"queries": 0, "candidates": 0, "narrowTests": 0, "rebuckets": 0}
+
+    def cellRange(self, rect):
+        '''This method returns the (left, top, right, bottom) cell indices covered by a Rect, clamped to the grid.'''
+        size = self.cellSize
+        left = min(max(rect.left // size, 0), self.columns - 1)
+        top = min(max(rect.top // size, 0), self.rows - 1)
+        right = min(max((rect.right - 1) // size, 0), self.columns - 1)
+        bottom = min(max((rect.bottom - 1) // size, 0), self.rows - 1)
+        return (left, top, right, bottom)
+
+    def insert(self, sprite, cellRange):
+        '''This method adds a sprite to every cell in the given range.'''
+        left, top, right, bottom = cellRange
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self.cells.get((column, row))
+                if cell is None:
+                    cell = self.cells[(column, row)] = set()
+                cell.add(sprite)
+        self.spriteCells[sprite] = cellRange
+
+    def erase(self, sprite):
+        '''This method takes a sprite out of every cell it is in.'''
+        left, top, right, bottom = self.spriteCells.pop(sprite)
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                self.cells[(column, row)].discard(sprite)
+
+    def add_internal(self, sprite, layer=None):
+        '''This method adds a sprite to the group and the grid internally. It is called by pygame.'''
+        pygame.sprite.AbstractGroup.add_internal(self, sprite)
+        self.insert(sprite, self.cellRange(sprite.rect))
+
+    def remove_internal(self, sprite):
+        '''This method removes a sprite from the group and the grid internally. It is called by pygame, e.g. when a sprite is killed.'''
+        self.erase(sprite)
+        pygame.sprite.AbstractGroup.remove_internal(self, sprite)
+
+    def refresh(self):
+        '''This method should be called once per frame after the sprites have moved. Only the sprites that crossed into different cells are moved in the grid, and the frame's counters are saved.'''
+        for sprite, oldRange in list(self.spriteCells.items()):
+            newRange = self.cellRange(sprite.rect)
+            if newRange != oldRange:
+                self.erase(sprite)
+                self.insert(sprite, newRange)
+                self.rebuckets += 1
+
+        self.lastFrame = {"queries": self.queries, "candidates": self.candidates, "narrowTests": self.narrowTests, "rebuckets": self.rebuckets}
+        self.queries = 0
+        self.candidates = 0
+        self.narrowTests = 0
+        self.rebuckets = 0
+
+    def collide(self, sprite, dokill):
+        '''This method returns a list of the sprites in the group whose visible pixels overlap the given sprite's, killing them if dokill is True.'''
+        self.queries += 1
+        left, top, right, bottom = self.cellRange(sprite.rect)
+        candidates = set()
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self.cells.get((column, row))
+                if cell:
+                    candidates.update(cell)
+        self.candidates += len(candidates)
+
+        rect = sprite.rect
+        collisions = []
+        for candidate in candidates:
+            if rect.colliderect(candidate.rect):
+                self.narrowTests += 1
+                if masksOverlap(sprite.image, rect.topleft, candidate.image, candidate.rect.topleft):
+                    collisions.append(candidate)
+        if dokill:
+            for candidate in collisions:
+                candidate.kill()
+        return collisions
+
+    def getStats(self):
+        '''This method returns the counters of the last finished frame along with the number of sprites and occupied cells.'''
+        stats = dict(self.lastFrame)
+        stats["sprites"] = len(self.spritedict)
+        stats["occupiedCells"] = sum(1 for cell in self.cells.values() if cell)
+        return stats
@@ -0,0 +1,79 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The entity registry module for the Dragonfire game. Every sprite registers itself when it is created and is forgotten as soon as it is garbage collected, so the number of live entities of each type and the Surface memory they hold can be checked at any time. A warning is printed when a type grows past its threshold, which is how leaks such as a sprite being built every frame show up.
+'''
+
+import weakref
+
+# Number of live entities of one type that is considered a leak, unless the type has its own threshold
+DEFAULT_THRESHOLD = 100
+thresholds = {}
+
+# Live entities of each type, which drop out by themselves once they are garbage collected
+entities = {}
+
+# Highest number of live entities seen for each type, and the types that have been warned about
+peaks = {}
+warned = set()
+
+
+def register(entity):
+    '''This function records a new entity under the name of its class and prints a warning the first time that type grows past its threshold.'''
+    typeName = type(entity).__name__
+    live = entities.get(typeName)
+    if live is None:
+        live = entities[typeName] = weakref.WeakSet()
+    live.add(entity)
+
+    count = len(live)
+    if count > peaks.get(typeName, 0):
+        peaks[typeName] = count
+        if count > thresholds.get(typeName, DEFAULT_THRESHOLD) and typeName not in warned:
+            warned.add(typeName)
+            print("Warning: %d live %s entities, over the threshold of %d" % (count, typeName, thresholds.get(typeName, DEFAULT_THRESHOLD)))
+
+
+def setThreshold(typeName, threshold):
+    '''This function sets the number of live entities of the given type that triggers a warning.'''
+    thresholds[typeName] = threshold
+    warned.discard(typeName)
+
+
+def liveCounts():
+    '''This function returns a dictionary mapping each entity type to the number of its entities still alive.'''
+    return dict((typeName, len(live)) for typeName, live in entities.items())
+
+
+def surfaceBytes():
+    '''This function returns the bytes of pixel memory held by the images of live entities. Surfaces shared by several entities, or subsurfaces of the same sheet, are only counted once.'''
+    seen = {}
+    for live in entities.values():
+        for entity in list(live):
+            image = getattr(entity, "image", None)
+            if image is not None:
+                # A subsurface shares the pixels of the Surface it was cut from
+                parent = image.get_abs_parent()
+                seen[id(parent)] = parent.get_pitch() * parent.get_height()
+    return sum(seen.values())
+
+
+def getStats():
+    '''This function returns a dictionary of the live and peak counts of each type, the total live entities, and their Surface memory.'''
+    counts = liveCounts()
+    return {
+        "live": counts,
+        "peak": dict(peaks),
+        "total": sum(counts.values()),
+        "surfaceBytes": surfaceBytes()
+    }
+
+
+def printReport():
+    '''This function prints the live and peak count of each entity type and the Surface memory they hold.'''
+    stats = getStats()
+    print("%-12s %6s %6s" % ("entity", "live", "peak"))
+    for typeName in sorted(stats["peak"]):
+        print("%-12s %6d %6d" % (typeName, stats["live"].get(typeName, 0), stats["peak"][typeName]))
+    print("%d live entities holding %.1f KiB of Surfaces" % (stats["total"], stats["surfaceBytes"] / 1024))
@@ -0,0 +1,135 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The fireball pool module for the Dragonfire game. A FireballPool keeps a preallocated set of Fireball sprites that are reset and reused instead of being built for every shot.
+'''
+
+import mySprites, scene, collision
+
+
+class FireballPool:
+    '''This class defines a pool of reusable Fireball sprites with a cap on how many can be alive at once.'''
+    def __init__(self, cap, preallocate=None):
+        '''This initializer takes the most Fireballs that may be alive at once and how many to build up front, which defaults to the cap.'''
+        if preallocate is None:
+            preallocate = cap
+        self.cap = cap
+        self.free = [self.build() for number in range(preallocate)]
+        self.active = set()
+
+        # Live Fireballs bucketed for collision tests, and the Scene they are drawn in
+        self.group = collision.SpatialHash()
+        self.scene = None
+
+        # Metrics
+        self.allocated = preallocate
+        self.spawns = 0
+        self.exhausted = 0
+        self.peak = 0
+
+    def build(self):
+        '''This method creates a new Fireball that belongs to this pool.'''
+        fireball = mySprites.Fireball(1, ((0, 0), (0, 0)), 0)
+        fireball.pool = self
+        return fireball
+
+    def attach(self, stageScene):
+        '''This method sets the Scene that new Fireballs are added to, at the start of every stage.'''
+        self.scene = stageScene
+
+    def spawn(self, stage, direction, level):
+        '''This method takes the stage, direction, and level of a new Fireball and returns a reset Fireball from the pool, or None if the cap has been reached.'''
+        if len(self.active) >= self.cap:
+            self.exhausted += 1
+            return None
+        if self.free:
+            fireball = self.free.pop()
+        else:
+            fireball = self.build()
+            self.allocated += 1
+
+        fireball.reset(stage, direction, level)
+        self.active.add(fireball)
+        self.group.add(fireball)
+        if self.scene is not None:
+            self.scene.add(fireball, layer=scene.PROJECTILES)
+        self.spawns += 1
+        self.peak = max(self.peak, len(self.active))
+        return fireball
+
+    def release(self, fireball):
+        '''This method returns a Fireball to the pool. It is called by Fireball.kill().'''
+        if fireball in self.active:
+            self.active.remove(fireball)
+            self.free.append(fireball)
+
+    def collide(self, player):
+        '''This method kills every Fireball touching the player and returns how many there were.'''
+        return len(self.group.collide(player, True))
+
+    def update(self):
+        '''This method moves the Fireballs that crossed into other cells of the collision grid. The Fireballs themselves are updated by the Scene they were added to.'''
+        self.group.refresh()
+
+    def clear(self, surface, background):
+        '''This method does nothing. Pooled Fireballs are cleared by the Scene they were added to.'''
+
+    def draw(self, surface, alpha=1.0):
+        '''This method returns an empty list. Pooled Fireballs are drawn by the Scene they were added to.'''
+        return []
+
+    def positions(self):
+        '''This method returns the sorted top left corners of the live Fireballs.'''
+        return sorted(fireball.rect.topleft for fireball in self.active)
+
+    def releaseAll(self):
+        '''This method kills every live Fireball, e.g. when a stage ends.'''
+        for fireball in list(self.active):
+            fireball.kill()
+
+    def getState(self):
+        '''This method returns the sorted state of the live Fireballs as (stage, left, top, dx, dy, end, phase) tuples. The end is the x or y coordinate the Fireball flies to, and the phase is the number of ticks into its animation cycle.'''
+        states = []
+        for fireball in self.active:
+            animation = fireball.animation
+            phase = animation.ticks
+            for image, duration in animation.table[:animation.index]:
+                phase += duration
+            end = fireball.endLocation[0] if fireball.stage == 1 else fireball.endLocation[1]
+            states.append((fireball.stage, fireball.rect.left, fireball.rect.top, fireball.dx, fireball.dy, end, phase))
+        return sorted(states)
+
+    def setState(self, states):
+        '''This method replaces the live Fireballs with ones in the given states, as returned by getState().'''
+        self.releaseAll()
+        for stage, left, top, dx, dy, end, phase in states:
+            fireball = self.spawn(stage, ((left, top), (end, end)), 0)
+            fireball.rect.topleft = (left, top)
+            fireball.dx = dx
+            fireball.dy = dy
+
+            # Find the animation frame the phase falls in
+            animation = fireball.animation
+            index = 0
+            while phase >= animation.table[index][1]:
+                phase -= animation.table[index][1]
+                index += 1
+            animation.index = index
+            animation.ticks = phase
+            animation.image = fireball.image = animation.table[index][0]
+
+            # Bucket the Fireball where it was moved to
+            self.group.remove(fireball)
+            self.group.add(fireball)
+
+    def getStats(self):
+        '''This method returns a dictionary of the pool metrics.'''
+        return {
+            "active": len(self.active),
+            "free": len(self.free),
+            "allocated": self.allocated,
+            "peak": self.peak,
+            "spawns": self.spawns,
+            "exhausted": self.exhausted
+        }
@@ -0,0 +1,167 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The frame capture module for the Dragonfire game. A FrameCapture copies the pixels of the screen after every presented frame, or every Nth one, into one of a few buffers allocated up front, and a worker thread writes them out as a PNG sequence or as one raw video file. The game never waits for the worker: when every buffer is still queued, the frame is dropped and counted instead.
+'''
+
+import pygame, os, queue, sys, tempfile, threading, time, gameLoop
+
+# Frames that can wait for the worker before new ones are dropped
+DEFAULT_QUEUE_SIZE = 8
+
+# Byte order of 32 bit screens by their (red, green, blue) masks, and the name ffmpeg gives each one
+PIXEL_FORMATS = {
+    (0xff0000, 0xff00, 0xff): ("BGRA", "bgr0"),
+    (0xff, 0xff00, 0xff0000): ("RGBA", "rgb0")
+}
+
+
+class FrameCapture:
+    '''This class defines a recorder of the screen whose frames are written out on a background thread.'''
+    def __init__(self, screen, path, interval=1, queueSize=DEFAULT_QUEUE_SIZE, frameRate=gameLoop.TICK_RATE):
+        '''This initializer takes the screen Surface, where to write the frames, how many presented frames there are to every captured one, how many frames can wait to be written, and how many frames are presented per second. A path ending in .raw is written as one raw video file, any other path is a directory for a PNG sequence.'''
+        self.screen = screen
+        self.path = path
+        self.interval = max(1, interval)
+        self.frameRate = frameRate
+        self.size = screen.get_size()
+        self.raw = path.lower().endswith(".raw")
+
+        # Copy the screen's own bytes if they are plain 32 bit pixels, otherwise convert them to RGB
+        masks = tuple(screen.get_masks()[:3])
+        if screen.get_bytesize() == 4 and screen.get_pitch() == self.size[0] * 4 and masks in PIXEL_FORMATS:
+            self.format, self.ffmpegFormat = PIXEL_FORMATS[masks]
+            frameBytes = self.size[0] * self.size[1] * 4
+        else:
+            self.format, self.ffmpegFormat = "RGB", "rgb24"
+            frameBytes = self.size[0] * self.size[1] * 3
+
+        # The worker reads 32 bit frames through a Surface with the screen's masks and no alpha mask, since the fourth byte is padding
+        self.frame = None
+        if self.format != "RGB":
+            self.frame = pygame.Surface(self.size, 0, 32, masks + (0,))
+
+        # Every buffer is either free or waiting for the worker, so the memory used never grows
+        self.free = queue.Queue()
+        for number in range(max(1, queueSize)):
+            self.free.put(bytearray(frameBytes))
+        self.filled = queue.Queue()
+
+        # Instance variables
+        self.outputFile = None
+        self.presented = 0
+        self.thread = threading.Thread(target=self.run, name="FrameCapture", daemon=True)
+
+        # Metrics
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.copyTime = 0.0
+        self.writeTime = 0.0
+
+    def start(self):
+        '''This method opens the output and starts the worker thread.'''
+        if self.raw:
+            self.outputFile = open(self.path, "wb")
+        else:
+            os.makedirs(self.path, exist_ok=True)
+        self.thread.start()
+
+    def capture(self, screen):
+        '''This method copies the given screen into a free buffer and queues it for the worker, if this is a frame to capture. The frame is dropped if no buffer is free.'''
+        self.presented += 1
+        if (self.presented - 1) % self.interval != 0:
+            return
+        number = self.captured
+        self.captured += 1
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        start = time.perf_counter()
+        if self.format == "RGB":
+            buffer[:] = pygame.image.tobytes(screen, "RGB")
+        else:
+            buffer[:] = screen.get_buffer()
+        self.copyTime += time.perf_counter() - start
+        self.filled.put((number, buffer))
+
+    def write(self, number, buffer):
+        '''This method writes one frame out. It runs on the worker thread.'''
+        if self.raw:
+            self.outputFile.write(buffer)
+        elif self.frame is None:
+            frame = pygame.image.frombuffer(buffer, self.size, "RGB")
+            pygame.image.save(frame, os.path.join(self.path, "frame%06d.png" % number))
+        else:
+            self.frame.get_buffer().write(bytes(buffer))
+            pygame.image.save(self.frame, os.path.join(self.path, "frame%06d.png" % number))
+
+    def run(self):
+        '''This method writes the queued frames in order until close() is called. It runs on the worker thread.'''
+        while True:
+            item = self.filled.get()
+            if item is None:
+                break
+            number, buffer = item
+            start = time.perf_counter()
+            self.write(number, buffer)
+            self.writeTime += time.perf_counter() - start
+            self.written += 1
+            self.free.put(buffer)
+
+    def close(self):
+        '''This method waits for the queued frames to be written and closes the output.'''
+        if self.thread.is_alive():
+            self.filled.put(None)
+            self.thread.join()
+        if self.outputFile is not None:
+            self.outputFile.close()
+            self.outputFile = None
+
+    def getStats(self):
+        '''This method returns a dictionary of the capture metrics.'''
+        copied = self.captured - self.dropped
+        return {
+            "captured": self.captured,
+            "written": self.written,
+            "dropped": self.dropped,
+            "waiting": self.filled.qsize(),
+            "averageCopyMs": self.copyTime * 1000 / copied if copied else 0.0,
+            "averageWriteMs": self.writeTime * 1000 / self.written if self.written else 0.0
+        }
+
+    def printReport(self):
+        '''This method prints how many frames were written and dropped, and how a raw file can be played.'''
+        stats = self.getStats()
+        print("%d frames captured, %d written and %d dropped" % (stats["captured"], stats["written"], stats["dropped"]))
+        print("%.2f ms to copy a frame and %.2f ms to write one" % (stats["averageCopyMs"], stats["averageWriteMs"]))
+        if self.raw:
+            print("ffmpeg -f rawvideo -pixel_format %s -video_size %dx%d -framerate %g -i %s capture.mp4" % (self.ffmpegFormat, self.size[0], self.size[1], self.frameRate / self.interval, self.path))
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((64, 48))
+    colours = [(200, 40, 10), (10, 200, 40), (40, 10, 200)]
+
+    # Check that every saved frame reads back opaque and in the colour it was captured in
+    failures = 0
+    with tempfile.TemporaryDirectory() as path:
+        frameCapture = FrameCapture(screen, path, queueSize=len(colours))
+        frameCapture.start()
+        for colour in colours:
+            screen.fill(colour)
+            frameCapture.capture(screen)
+        frameCapture.close()
+        for number, colour in enumerate(colours):
+            frame = pygame.image.load(os.path.join(path, "frame%06d.png" % number))
+            if frame.get_flags() & pygame.SRCALPHA or tuple(frame.get_at((0, 0))) != colour + (255,):
+                failures += 1
+        frameCapture.printReport()
+    print("%d frames did not read back opaque" % failures)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,80 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The game loop module for the Dragonfire game. A FixedTimestepLoop runs the game logic at a fixed number of ticks per second no matter how long frames take to draw. Time that has passed is collected in an accumulator and paid back with extra ticks, with a limit on how many ticks may run between two rendered frames. Rendering can run at a different rate than the logic, optionally drawing sprites partway between their last two positions.
+'''
+
+import pygame, time
+
+# Ticks per second of the game logic, which all speeds in the game are tuned for
+TICK_RATE = 30
+
+# Most ticks run before a frame is rendered when the game falls behind
+MAX_FRAME_SKIP = 5
+
+
+class FixedTimestepLoop:
+    '''This class defines a game loop with a fixed logic tick and a separate render rate.'''
+    def __init__(self, tickRate=TICK_RATE, renderRate=None, maxFrameSkip=MAX_FRAME_SKIP, interpolate=False, timer=time.perf_counter):
+        '''This initializer takes the logic ticks per second, the rendered frames per second (the tick rate by default), the most ticks run between two frames, whether to interpolate sprite positions, and the function that returns the time in seconds.'''
+        self.tickLength = 1 / tickRate
+        self.renderRate = renderRate or tickRate
+        self.maxFrameSkip = maxFrameSkip
+        self.interpolate = interpolate
+        self.timer = timer
+
+        # Seconds of game time that have passed but not been ticked yet
+        self.accumulator = 0.0
+
+        # Metrics
+        self.ticks = 0
+        self.renders = 0
+        self.skippedFrames = 0
+        self.droppedTicks = 0
+
+    def advance(self, game, elapsed):
+        '''This method adds the elapsed seconds to the accumulator and runs the ticks that are due. It returns how far the game is into the next tick, from 0 to 1.'''
+        self.accumulator += elapsed
+        ticks = 0
+        while self.accumulator >= self.tickLength and ticks < self.maxFrameSkip and not game.endGame:
+            game.tick()
+            self.accumulator -= self.tickLength
+            ticks += 1
+        self.ticks += ticks
+
+        # Every tick after the first one stands in for a frame that was not rendered
+        if ticks > 1:
+            self.skippedFrames += ticks - 1
+
+        # Past the frame skip limit the game slows down instead of falling further behind
+        if self.accumulator >= self.tickLength:
+            dropped = int(self.accumulator / self.tickLength)
+            self.droppedTicks += dropped
+            self.accumulator -= dropped * self.tickLength
+        return self.accumulator / self.tickLength
+
+    def run(self, game):
+        '''This method runs the game until it is over, ticking and rendering at their own rates.'''
+        clock = pygame.time.Clock()
+        previous = self.timer()
+        while not game.endGame:
+            clock.tick(self.renderRate)
+            now = self.timer()
+            alpha = self.advance(game, now - previous)
+            previous = now
+
+            if self.interpolate:
+                game.render(alpha)
+            else:
+                game.render()
+            self.renders += 1
+
+    def getStats(self):
+        '''This method returns a dictionary of the loop metrics.'''
+        return {
+            "ticks": self.ticks,
+            "renders": self.renders,
+            "skippedFrames": self.skippedFrames,
+            "droppedTicks": self.droppedTicks
+        }
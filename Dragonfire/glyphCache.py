@@ -0,0 +1,58 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The glyph cache module for the Dragonfire game. Each character of a font is rendered once, and text is composed by copying the cached glyphs side by side.
+'''
+
+import pygame, assetCache
+
+# Glyph caches keyed by (font file, size, color) so every ScoreKeeper shares them
+glyphCaches = {}
+
+
+class GlyphCache:
+    '''This class defines a cache of rendered glyphs for one font and color.'''
+    def __init__(self, font, color):
+        '''This initializer takes the font and the text color.'''
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+
+        # Instance variables
+        self.glyphs = {}
+        self.renders = 0
+
+    def getGlyph(self, character):
+        '''This method returns the rendered Surface of a single character, rendering it the first time it is needed.'''
+        glyph = self.glyphs.get(character)
+        if glyph is None:
+            glyph = self.font.render(character, 1, self.color)
+            self.glyphs[character] = glyph
+            self.renders += 1
+        return glyph
+
+    def render(self, text):
+        '''This method returns a new Surface with the given text composed from cached glyphs.'''
+        glyphs = [self.getGlyph(character) for character in text]
+        width = 0
+        for glyph in glyphs:
+            width += glyph.get_width()
+        image = pygame.Surface((width, self.height), pygame.SRCALPHA)
+
+        # Copy each glyph's pixels and coverage as they are instead of blending them onto the empty Surface
+        left = 0
+        for glyph in glyphs:
+            image.blit(glyph, (left, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            left += glyph.get_width()
+        return image
+
+
+def getGlyphCache(fileName, size, color):
+    '''This function returns the shared GlyphCache for the given font file, size, and color.'''
+    key = (fileName, size, color)
+    glyphCache = glyphCaches.get(key)
+    if glyphCache is None:
+        glyphCache = GlyphCache(assetCache.loadFont(fileName, size), color)
+        glyphCaches[key] = glyphCache
+    return glyphCache
@@ -0,0 +1,64 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The headless module for the Dragonfire game. A Simulation runs a game on SDL's dummy video and audio drivers, driven by an input policy instead of the keyboard. Frames are only run when the caller steps them, with no frame rate cap, and nothing is drawn unless asked for. Running this module prints how many frames per second a random player reaches.
+'''
+
+import pygame, os, random, time, assetCache, assetBundle, soundBank, presenter, runtime, inputSource, stages
+
+
+def useDummyDrivers():
+    '''This function makes SDL use its dummy video and audio drivers, so no window is opened and no sound is played. It has to be called before the display is initialized.'''
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def createRuntime(source, projectiles="pool", render=False, fireballCap=runtime.FIREBALL_CAP):
+    '''This function opens the dummy display and returns a Runtime for the given input source and fireball engine.'''
+    useDummyDrivers()
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+
+    # Use the pre-decoded asset bundle if it has been packed
+    if assetCache.bundle is None:
+        assetCache.bundle = assetBundle.openBundle()
+
+    return runtime.Runtime(screen, soundBank.SoundBank(runtime.SOUND_EFFECTS), presenter.Presenter(screen), runtime.createFireballs(projectiles, fireballCap), source, render)
+
+
+class Simulation:
+    '''This class defines a game of Dragonfire that runs without a window, one frame per call to step().'''
+    def __init__(self, policy=None, seed=None, highScore=0, lives=7, projectiles="pool", render=False, source=None, level=0):
+        '''This initializer takes the policy that chooses the held keys each frame, the seed for the game's random numbers, the highscore, the starting lives, and the fireball engine. If render is True every frame is still drawn to the dummy screen. An input source, such as a replay, can be given instead of a policy, and the game can start at a higher level of difficulty.'''
+        if seed is not None:
+            random.seed(seed)
+
+        if source is None:
+            source = inputSource.ScriptedInput(policy)
+        self.runtime = createRuntime(source, projectiles, render)
+        self.game = stages.Game(self.runtime, highScore, lives, level)
+
+    def step(self, frames=1):
+        '''This method runs up to the given number of frames and returns False once the game is over.'''
+        game = self.game
+        for frame in range(frames):
+            if game.endGame:
+                break
+            game.step()
+        return not game.endGame
+
+    def run(self, frames):
+        '''This method runs up to the given number of frames as fast as possible and returns how many frames per second were reached.'''
+        startFrame = self.game.frames
+        start = time.perf_counter()
+        self.step(frames)
+        elapsed = time.perf_counter() - start
+        return (self.game.frames - startFrame) / elapsed if elapsed else 0.0
+
+
+if __name__ == "__main__":
+    simulation = Simulation(inputSource.randomPolicy(1), seed=1)
+    framesPerSecond = simulation.run(3000)
+    game = simulation.game
+    print("%d frames at %.0f frames per second, level %d, stage %d" % (game.frames, framesPerSecond, game.level, game.stageNumber))
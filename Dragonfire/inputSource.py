@@ -0,0 +1,63 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The input source module for the Dragonfire game. An input source hands the stages the events and held keys of each frame, either from the keyboard or from a policy that decides which keys to hold, so a game can be played without a window.
+'''
+
+import pygame, random
+
+# Keys the stages respond to
+MOVEMENT_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+class KeyState:
+    '''This class defines the held keys of a frame. Like the sequence returned by pygame.key.get_pressed(), it is indexed by key.'''
+    def __init__(self, held):
+        '''This initializer takes the keys being held.'''
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        '''This method returns True if the key is held.'''
+        return key in self.held
+
+
+class PygameInput:
+    '''This class defines the input source that reads the keyboard and window events from pygame.'''
+    def poll(self, game):
+        '''This method returns the events and held keys of the current frame.'''
+        keysPressed = pygame.key.get_pressed()
+        return pygame.event.get(), keysPressed
+
+
+class ScriptedInput:
+    '''This class defines an input source driven by a policy. The policy is called every frame with the game and returns the keys to hold, and the key presses and releases are worked out from the difference.'''
+    def __init__(self, policy):
+        '''This initializer takes the policy function.'''
+        self.policy = policy
+        self.held = frozenset()
+
+    def poll(self, game):
+        '''This method returns the events and held keys of the current frame.'''
+        held = frozenset(self.policy(game))
+        events = [pygame.event.Event(pygame.KEYUP, key=key) for key in sorted(self.held - held)]
+        events += [pygame.event.Event(pygame.KEYDOWN, key=key) for key in sorted(held - self.held)]
+        self.held = held
+        return events, KeyState(held)
+
+
+def randomPolicy(seed=None, changeChance=0.2):
+    '''This function returns a policy that holds a random set of movement keys and changes it now and then. It uses its own random generator so it does not disturb the game's.'''
+    rng = random.Random(seed)
+    held = set()
+
+    def policy(game):
+        '''This function returns the keys to hold on this frame.'''
+        if rng.random() < changeChance:
+            key = rng.choice(MOVEMENT_KEYS)
+            if key in held:
+                held.remove(key)
+            else:
+                held.add(key)
+        return held
+    return policy
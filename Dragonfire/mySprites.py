@@ -5,7 +5,30 @@
     Description: The sprite module for the Dragonfire game. It contains the Player, Portal, Fireball, Dragon, Treasure, ScoreKeeper, and Life sprites essential for the game logic.
 '''
 
-import pygame, random
+import pygame, assetCache, atlas, animation, glyphCache, entityRegistry
+
+# Animation frame tables as (frame name, duration in ticks) pairs
+PLAYER_ANIMATIONS = {
+    "standLeft": (("playerLeft1", 1),),
+    "standRight": (("playerRight1", 1),),
+    "runLeft": (("playerLeft1", 3), ("playerLeft2", 3)),
+    "runRight": (("playerRight1", 3), ("playerRight2", 3)),
+    "crouchLeft": (("playerLeftCrouched", 1),),
+    "crouchRight": (("playerRightCrouched", 1),)
+}
+
+DRAGON_ANIMATIONS = {
+    "walkLeft": (("dragonLeft1", 4), ("dragonLeft2", 4), ("dragonLeft3", 4)),
+    "walkRight": (("dragonRight1", 4), ("dragonRight2", 4), ("dragonRight3", 4)),
+    "shootLeft": (("dragonLeftShoot", 6),),
+    "shootRight": (("dragonRightShoot", 6),)
+}
+
+FIREBALL_ANIMATIONS = {
+    "side": (("sideFireball1", 3), ("sideFireball2", 3)),
+    "up": (("upFireball1", 3), ("upFireball2", 3))
+}
+
             
 class Player(pygame.sprite.Sprite):
     '''This class defines the player sprite that can duck, jump, move left, and right in stage 1 and can move up, down, left, and right in stage 2.'''
@@ -13,43 +36,44 @@ class Player(pygame.sprite.Sprite):
         '''This initializer takes the screen surface, stage, and spawnLocation as parameters. The player will be positioned at the given spawnLocation to start.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
         
-        # Load player images
-        self.playerLeft1 = pygame.image.load("myImages/playerLeft1.PNG").convert()
-        self.playerLeft2 = pygame.image.load("myImages/playerLeft2.PNG").convert()        
-        self.playerRight1 = pygame.image.load("myImages/playerRight1.PNG").convert()
-        self.playerRight2 = pygame.image.load("myImages/playerRight2.PNG").convert()
-        self.playerLeftCrouched = pygame.image.load("myImages/playerLeftCrouched.PNG").convert()
-        self.playerRightCrouched = pygame.image.load("myImages/playerRightCrouched.PNG").convert()
+        # Load player animations
+        self.animation = animation.Animation(atlas.loadFrames("player"), PLAYER_ANIMATIONS, "standLeft")
        
         # Set initial image
-        self.image = self.playerLeft1
+        self.image = self.animation.image
+        self.rect = self.image.get_rect()
+        
+        # Instance variables
+        self.window = screen
+        self.stage = stage
+        
+        self.spawn(spawnLocation)
+        
+    def spawn(self, spawnLocation):
+        '''This method puts the player back at the given spawn location the way they start a stage, standing still and facing left.'''
+        self.animation.restart("standLeft")
+        self.image = self.animation.image
        
         # Spawn the player on the right side of the drawbridge
-        self.rect = self.image.get_rect()
+        self.rect.size = self.image.get_size()
         self.rect.right = spawnLocation[0] - 1
         self.rect.bottom = spawnLocation[1]
 
         # Set the initial x and y vectors for the player
         self.dx = 0
         self.dy = 0
-        
-        # Instance variables
-        self.window = screen
         self.directionFacing = 1
         self.crouched = False
-        self.imageChangeCounter = 0
-        self.stage = stage
         
     def changeDirection(self, direction, xChange):
-        '''This method changes the x and y vector of the player using the provided direction parameter and changes the image accordingly.'''
+        '''This method changes the x and y vector of the player using the provided direction parameter. The image is picked in update().'''
         if self.stage == 2:
             if xChange == 1:
                 if direction[0] < 0:
-                    self.image = self.playerLeft1
                     self.directionFacing = 1
                 elif direction[0] > 0:
-                    self.image = self.playerRight1
                     self.directionFacing = 0
                 self.dx = direction[0]
             else:
@@ -57,10 +81,8 @@ class Player(pygame.sprite.Sprite):
         else:
             if self.crouched == False:
                 if direction[0] < 0:
-                    self.image = self.playerLeft1
                     self.directionFacing = 1
                 elif direction[0] > 0:
-                    self.image = self.playerRight1
                     self.directionFacing = 0
                 self.dx = direction[0]
         
@@ -74,9 +96,10 @@ class Player(pygame.sprite.Sprite):
         '''This method puts the player in a crouch position by changing the image if thay are standing, otherwise it will cause the player to stand up again.'''
         if self.crouched == False:
             if self.directionFacing == 1:
-                self.image = self.playerLeftCrouched
+                self.animation.setState("crouchLeft")
             else:
-                self.image = self.playerRightCrouched
+                self.animation.setState("crouchRight")
+            self.image = self.animation.image
             self.tempLeftRect = self.rect.left
             if self.rect.bottom != 312:
                 self.tempBottomRect = self.rect.bottom
@@ -90,9 +113,10 @@ class Player(pygame.sprite.Sprite):
                 
         else:
             if self.directionFacing == 1:
-                self.image = self.playerLeft1
+                self.animation.setState("standLeft")
             else:
-                self.image = self.playerRight1 
+                self.animation.setState("standRight")
+            self.image = self.animation.image
             self.tempLeftRect = self.rect.left
             self.rect = self.image.get_rect()
             self.rect.bottom = 312
@@ -104,6 +128,18 @@ class Player(pygame.sprite.Sprite):
         '''This method moves the player back to the desired spawn location.'''
         self.rect.right = spawnLocation[0] - 1
         self.rect.bottom = spawnLocation[1]
+        
+    def animationState(self):
+        '''This method returns the name of the animation that matches what the player is currently doing.'''
+        if self.crouched:
+            state = "crouch"
+        elif self.dx != 0 or (self.stage == 2 and self.dy != 0):
+            state = "run"
+        else:
+            state = "stand"
+        if self.directionFacing == 1:
+            return state + "Left"
+        return state + "Right"
          
     def update(self):
         '''This method will be called automatically to reposition the player sprite on the screen and cycle between the running images.'''
@@ -125,50 +161,20 @@ class Player(pygame.sprite.Sprite):
                 self.rect.bottom = 312
                 self.dy = 0
         
-        # Cycle between images to create running effect  
-        if self.dx != 0: 
-            if self.imageChangeCounter > 1:
-                if self.directionFacing == 1:
-                    if self.image == self.playerLeft1:
-                        self.image = self.playerLeft2
-                    else:
-                        self.image = self.playerLeft1
-                else:
-                    self.tempBottomRightRect = self.rect.bottomright 
-                    if self.image == self.playerRight1:
-                        self.image = self.playerRight2
-                    else:
-                        self.image = self.playerRight1
-                    self.rect = self.image.get_rect()
-                    self.rect.bottomright = self.tempBottomRightRect   
-                self.imageChangeCounter = 0
-            else:
-                self.imageChangeCounter += 1
-        elif self.stage == 2 and self.dy != 0:
-            if self.imageChangeCounter > 1:
-                if self.directionFacing == 1:
-                    if self.image == self.playerLeft1:
-                        self.image = self.playerLeft2
-                    else:
-                        self.image = self.playerLeft1
-                else:
-                    self.tempBottomRightRect = self.rect.bottomright 
-                    if self.image == self.playerRight1:
-                        self.image = self.playerRight2
-                    else:
-                        self.image = self.playerRight1
-                    self.rect = self.image.get_rect()
-                    self.rect.bottomright = self.tempBottomRightRect  
-                self.imageChangeCounter = 0
+        # Advance the animation for the current state to create running effect
+        self.animation.setState(self.animationState())
+        image = self.animation.advance()
+        if image is not self.image:
+            # Keep the player anchored to the side it is facing when the frame size changes
+            if self.directionFacing == 1:
+                anchor = self.rect.bottomleft
+                self.rect.size = image.get_size()
+                self.rect.bottomleft = anchor
             else:
-                self.imageChangeCounter += 1
-        else:
-            if self.image != self.playerLeftCrouched and self.image != self.playerRightCrouched:
-                if self.directionFacing == 1:
-                    self.image = self.playerLeft1
-                else:
-                    self.image = self.playerRight1
-            self.imageChangeCounter += 1        
+                anchor = self.rect.bottomright
+                self.rect.size = image.get_size()
+                self.rect.bottomright = anchor
+            self.image = image
             
             
 class Portal(pygame.sprite.Sprite):
@@ -177,10 +183,11 @@ class Portal(pygame.sprite.Sprite):
         '''This initializer takes the stage and location as parameters. The portal will be spawned at the specified location and be invisible in the first stage'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
         
         # Load Portal images
-        self.openPortal = pygame.image.load("myImages/openPortal.PNG").convert()
-        self.closedPortal = pygame.image.load("myImages/closedPortal.PNG").convert()
+        self.openPortal = assetCache.loadImage("myImages/openPortal.PNG")
+        self.closedPortal = assetCache.loadImage("myImages/closedPortal.PNG")
         
         # Set appropriate image
         if stage == 1:
@@ -189,6 +196,7 @@ class Portal(pygame.sprite.Sprite):
             self.image.set_colorkey((0,0,0))
         else:
             self.image = self.openPortal
+        self.open = True
          
         # Spawn Portal in the specified location
         self.rect = self.image.get_rect()
@@ -196,33 +204,42 @@ class Portal(pygame.sprite.Sprite):
         
     def toggleImage(self):
         '''This method swaps the current Portal image witht he other one.'''
-        if self.image == self.openPortal:
+        if self.open:
             self.image = self.closedPortal
         else:
             self.image = self.openPortal
+        self.open = not self.open
         
         
 class Fireball(pygame.sprite.Sprite):
-    '''This class defines the Fireball sprite that can kill the player.'''
+    '''This class defines the Fireball sprite that can kill the player. Fireballs can be reused through reset() so a FireballPool can keep them around.'''
     def __init__(self, stage, direction, level):
         '''This initializer takes the stage, direction, and level as parameters. The appropriate image will be loaded based on the stage and the direction and speed will be calculated.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
+        
+        # Load Fireball animations
+        self.animation = animation.Animation(atlas.loadFrames("fireball"), FIREBALL_ANIMATIONS, "side")
+        self.image = self.animation.image
+        self.rect = self.image.get_rect()
         
-        # Load Fireball Images
-        self.sideFireball1 = pygame.image.load("myImages/sideFireball1.PNG").convert()
-        self.sideFireball2 = pygame.image.load("myImages/sideFireball2.PNG").convert() 
-        self.upFireball1 = pygame.image.load("myImages/upFireball1.PNG").convert()   
-        self.upFireball2 = pygame.image.load("myImages/upFireball2.PNG").convert()   
+        # The FireballPool this Fireball returns to when it is killed, if any
+        self.pool = None
         
+        self.reset(stage, direction, level)
+        
+    def reset(self, stage, direction, level):
+        '''This method sets up the Fireball to be shot again with the given stage, direction, and level, reusing its image and rect.'''
         # Set appropriate image
         if stage == 1:
-            self.image = self.sideFireball1
+            self.animation.restart("side")
         else:
-            self.image = self.upFireball1
+            self.animation.restart("up")
+        self.image = self.animation.image
         
         # Spawn Fireball in the specified location 
-        self.rect = self.image.get_rect()
+        self.rect.size = self.image.get_size()
         self.rect.left, self.rect.bottom = direction[0]
         
         # Calculate x and y vectors
@@ -238,10 +255,15 @@ class Fireball(pygame.sprite.Sprite):
             self.dy = -7 - level
         
         # Instance Variables
-        self.imageChangeCounter = 0
         self.stage = stage
         self.endLocation = direction[1]
         
+    def kill(self):
+        '''This method removes the Fireball from all of its groups and hands it back to its pool.'''
+        pygame.sprite.Sprite.kill(self)
+        if self.pool is not None:
+            self.pool.release(self)
+        
     def update(self):
         '''This method will be called automatically to reposition the Fireball sprite on the screen and cycle between the Fireball images.'''
         # Change image location
@@ -257,20 +279,7 @@ class Fireball(pygame.sprite.Sprite):
                 self.kill()
         
         # Cycle between images 
-        if self.imageChangeCounter > 1:
-            if self.stage == 1:
-                if self.image == self.sideFireball1:
-                    self.image = self.sideFireball2
-                else:
-                    self.image = self.sideFireball1
-            else:
-                if self.image == self.upFireball1: 
-                    self.image = self.upFireball2
-                else:
-                    self.image = self.upFireball1
-            self.imageChangeCounter = 0
-        else:
-            self.imageChangeCounter += 1
+        self.image = self.animation.advance()
             
             
 class Dragon(pygame.sprite.Sprite):
@@ -279,36 +288,34 @@ class Dragon(pygame.sprite.Sprite):
         '''This initializer takes the screen surface and level as parameters. The Dragon will be spawned at the bottom of the screen with a speed that increases with level.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
         
-        # Load Dragon Images
-        self.dragonLeft1 = pygame.image.load("myImages/dragonLeft1.PNG").convert()
-        self.dragonLeft2 = pygame.image.load("myImages/dragonLeft2.PNG").convert()
-        self.dragonLeft3 = pygame.image.load("myImages/dragonLeft3.PNG").convert()
-        self.dragonRight1 = pygame.image.load("myImages/dragonRight1.PNG").convert()
-        self.dragonRight2 = pygame.image.load("myImages/dragonRight2.PNG").convert()
-        self.dragonRight3 = pygame.image.load("myImages/dragonRight3.PNG").convert()
-        self.dragonLeftShoot = pygame.image.load("myImages/dragonLeftShoot.PNG").convert()
-        self.dragonRightShoot = pygame.image.load("myImages/dragonRightShoot.PNG").convert()
+        # Load Dragon animations
+        self.animation = animation.Animation(atlas.loadFrames("dragon"), DRAGON_ANIMATIONS, "walkRight")
         
         # Set initial image
-        self.image = self.dragonRight1
+        self.image = self.animation.image
+        self.rect = self.image.get_rect()
+        
+        # Instance variables
+        self.window = screen
+        
+        self.reset(level)
+        
+    def reset(self, level):
+        '''This method puts the Dragon back where it starts a stage, walking right with a speed that increases with level.'''
+        self.animation.restart("walkRight")
+        self.image = self.animation.image
         
         # Spawn the dragon on the bottom of the screen
-        self.rect = self.image.get_rect()
         self.rect.left = 100
         self.rect.bottom = 424
         
         # Set the initial x vector
         self.dx = 10 + level
         
-        # Instance variables
-        self.window = screen
-        self.imageCounter = 1
         self.directionFacing = 0
-        self.imageChangeCounter = 0
-        self.fireballCooldown = 0
         self.shooting = False
-        self.shootChangeCounter = 0
         
     def setShooting(self):
         '''This method set the shooting instance variable to True.'''
@@ -329,60 +336,40 @@ class Dragon(pygame.sprite.Sprite):
         
         # Cycle between walking and shooting images when appropriate
         if self.shooting == False:
-            if self.imageChangeCounter > 2:
-                if self.directionFacing == 1:
-                    if self.imageCounter == 1:
-                        self.image = self.dragonLeft2
-                    elif self.imageCounter == 2:
-                        self.image = self.dragonLeft3
-                    else:
-                        self.image = self.dragonLeft1            
-                else:
-                    if self.imageCounter == 1:
-                        self.image = self.dragonRight2
-                    elif self.imageCounter == 2:
-                        self.image = self.dragonRight3
-                    else:
-                        self.image = self.dragonRight1
-                self.imageChangeCounter = 0
-            else:
-                self.imageChangeCounter += 1
-            self.imageCounter += 1
-            if self.imageCounter > 3: 
-                self.imageCounter = 1
+            state = "walk"
         else:
-            if self.directionFacing == 1:
-                self.image = self.dragonLeftShoot
-            else:
-                self.image = self.dragonRightShoot
-            if self.shootChangeCounter == 5:
-                self.shooting = False
-                self.imageCounter = 1
-                self.shootChangeCounter = 0
-            else:
-                self.shootChangeCounter += 1
+            state = "shoot"
+        if self.directionFacing == 1:
+            self.animation.setState(state + "Left")
+        else:
+            self.animation.setState(state + "Right")
+        self.image = self.animation.advance()
+        
+        # Stop shooting once the shooting frame has been shown for its full duration
+        if self.shooting and self.animation.cycles > 0:
+            self.shooting = False
             
         
 class Treasure(pygame.sprite.Sprite):
-    '''This class defines the Treasure sprite that spawns in random location with a random image and value.'''
-    def __init__(self, previousTreasures):
-        '''This initializer takes a list of previous treasures as a parameter. The location, image, and value will be picked at random until it has a its own unique location not shared by any previous treasures.'''
+    '''This class defines the Treasure sprite that has an image matching its value. Treasures are spread over the stage by the placement module.'''
+    def __init__(self, value, location=(0, 0)):
+        '''This initializer takes the value of the treasure and the location of its top left corner.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
         
-        # Set random image
-        self.value = random.randrange(10, 60, 10)
-        self.image = pygame.image.load("myImages/treasure%d.PNG" % (self.value/10)).convert()
+        self.rect = pygame.Rect(location, (0, 0))
+        self.reset(value, location)
         
-        # Set random initial location
-        self.rect = self.image.get_rect()
-        self.rect.bottom = random.randrange(50, 370)
-        self.rect.left = random.randrange(10, 500)
+    def reset(self, value, location=(0, 0)):
+        '''This method gives the treasure a new value, with the image matching it, and moves its top left corner to the given location.'''
+        # Set the image for the value
+        self.value = value
+        self.image = assetCache.loadImage("myImages/treasure%d.PNG" % (self.value/10))
         
-        # Check if the chosen location is already occupied
-        while pygame.sprite.spritecollide(self, previousTreasures, False):
-            self.rect.bottom = random.randrange(50, 370)
-            self.rect.left = random.randrange(10, 500)   
+        # Set initial location
+        self.rect.size = self.image.get_size()
+        self.rect.topleft = location
             
     def move(self):
         '''This method moves the treasure off the screen so the player can't collide with it anymore.'''
@@ -392,32 +379,38 @@ class Treasure(pygame.sprite.Sprite):
 class ScoreKeeper(pygame.sprite.Sprite):
     '''This class defines the scoreKeeper sprite that records and displays the player's current or highscore.'''
     def __init__(self, highScore, score):
-        '''This initializer takes the score and highscore as parameters and loads the custom font "Pixelated" to display it on the screen.'''
+        '''This initializer takes the score and highscore as parameters and uses the shared glyphs of the custom font "Pixelated" to display it on the screen.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
  
-        # Load the custom font
-        self.font = pygame.font.Font("Pixelated.ttf", 30)
+        # Use the glyphs of the custom font shared by every ScoreKeeper
+        self.glyphs = glyphCache.getGlyphCache("pixelated.ttf", 30, (255, 255, 255))
         
         # Instance variables
         self.score = score
         self.highScore = highScore
+        self.renderedScore = None
  
     def addScore(self, score):
         '''This method adds the appropritate amount to the player's score.'''
         self.score += score
      
     def update(self):
-        '''This method will be called automatically to display the current or highscore at the bottom of the screen.'''
+        '''This method will be called automatically to display the current or highscore at the bottom of the screen. The text is only composed again when the score has changed.'''
+        if self.score == self.renderedScore:
+            return
+        self.renderedScore = self.score
+        
         # Adjust the message depending on whether it is a current or highscore being displayed
         if self.highScore == True:
             message = "High Score: %d" % self.score
-            self.image = self.font.render(message, 1, (255, 255, 255))
+            self.image = self.glyphs.render(message)
             self.rect = self.image.get_rect()
             self.rect.center = (150, 451)
         else:
             message = "Score: %d" % self.score
-            self.image = self.font.render(message, 1, (255, 255, 255))
+            self.image = self.glyphs.render(message)
             self.rect = self.image.get_rect()
             self.rect.center = (500, 451)            
         
@@ -428,9 +421,10 @@ class Life(pygame.sprite.Sprite):
         '''This initializer takes the amount of lives remaining and displays the correct amount of lives on the bottom of the screen.'''
         # Call the parent __init__() method
         pygame.sprite.Sprite.__init__(self)
+        entityRegistry.register(self)
         
         # Set the Life image
-        self.image = pygame.image.load("myImages/playerLife.png").convert()
+        self.image = assetCache.loadImage("myImages/playerLife.PNG")
         
         # Spawn the lives at the bottom of the screen
         self.rect = self.image.get_rect()
@@ -0,0 +1,148 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The overlay module for the Dragonfire game. A PerformanceOverlay shows the frame rate, a graph of recent frame times, frames that were skipped or late against the tick rate, how many sprites each group holds, how busy the mixer is, and what the overlay itself costs to draw. Pressing F3 shows or hides it. Its panel is drawn onto a Surface of its own, which is only redrawn a few times a second and copied to the screen every frame in between.
+'''
+
+import pygame, collections, time, glyphCache, gameLoop
+
+# Key that shows and hides the overlay
+TOGGLE_KEY = pygame.K_F3
+
+# Font and colors of the panel
+FONT_FILE = "pixelated.ttf"
+FONT_SIZE = 16
+TEXT_COLOR = (255, 255, 255)
+PANEL_COLOR = (0, 0, 0, 170)
+GRAPH_COLOR = (80, 220, 80)
+TARGET_COLOR = (220, 80, 80)
+
+# Where the panel is drawn, and its size
+PANEL_LOCATION = (5, 5)
+PANEL_SIZE = (230, 140)
+PADDING = 5
+
+# Frames shown in the graph, with this many pixels for each, and the graph's height, which spans twice the time of one tick
+GRAPH_FRAMES = 110
+GRAPH_STEP = 2
+GRAPH_HEIGHT = 36
+
+# Frames between redraws of the panel
+REDRAW_INTERVAL = 10
+
+# A frame that takes this many times longer than a tick is late
+LATE_FACTOR = 1.5
+
+
+class PerformanceOverlay:
+    '''This class defines a panel of performance metrics drawn over the game.'''
+    def __init__(self, loop=None, tickRate=gameLoop.TICK_RATE):
+        '''This initializer takes the FixedTimestepLoop whose skipped frames and dropped ticks are shown, if there is one, and the ticks per second frames are measured against.'''
+        self.loop = loop
+        self.tickTime = 1000 / tickRate
+        self.text = glyphCache.getGlyphCache(FONT_FILE, FONT_SIZE, TEXT_COLOR)
+        self.surface = pygame.Surface(PANEL_SIZE, pygame.SRCALPHA)
+        self.rect = self.surface.get_rect(topleft=PANEL_LOCATION)
+        self.visible = False
+
+        # Instance variables
+        self.frameTimes = collections.deque(maxlen=GRAPH_FRAMES)
+        self.drawTimes = collections.deque(maxlen=GRAPH_FRAMES)
+        self.lastFrame = None
+        self.drawnRect = None
+        self.framesSinceRedraw = REDRAW_INTERVAL
+
+        # Metrics
+        self.lateFrames = 0
+        self.redrawTime = 0.0
+
+    def toggle(self):
+        '''This method shows the overlay if it is hidden and hides it if it is shown.'''
+        self.visible = not self.visible
+        self.framesSinceRedraw = REDRAW_INTERVAL
+
+    def handleEvents(self, events):
+        '''This method toggles the overlay for every press of the toggle key among the given events.'''
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+                self.toggle()
+
+    def recordFrame(self):
+        '''This method records the time since the last frame, counting it as late if it took too long.'''
+        now = time.perf_counter()
+        if self.lastFrame is not None:
+            frameTime = (now - self.lastFrame) * 1000
+            self.frameTimes.append(frameTime)
+            if frameTime > self.tickTime * LATE_FACTOR:
+                self.lateFrames += 1
+        self.lastFrame = now
+
+    def getLines(self, stage, sounds):
+        '''This method returns the lines of text shown on the panel for the given stage and SoundBank.'''
+        frameTimes = self.frameTimes
+        average = sum(frameTimes) / len(frameTimes) if frameTimes else 0.0
+        fps = 1000 / average if average else 0.0
+
+        # Frames the loop skipped to catch up and ticks it gave up on, next to the frames that came late
+        lines = ["FPS %.1f  frame %.1f ms" % (fps, average)]
+        if self.loop is not None:
+            stats = self.loop.getStats()
+            lines.append("late %d skipped %d dropped %d" % (self.lateFrames, stats["skippedFrames"], stats["droppedTicks"]))
+        else:
+            lines.append("late %d" % self.lateFrames)
+
+        # Sprites in each group of the stage
+        counts = "sprites %d  fireballs %d" % (len(stage.allSprites), stage.runtime.fireballs.getStats()["active"])
+        if hasattr(stage, "treasureGroup"):
+            counts += "  treasure %d" % len(stage.treasureGroup)
+        lines.append(counts)
+
+        soundStats = sounds.getStats()
+        lines.append("voices %d/%d  steals %d" % (soundStats["busyVoices"], soundStats["voices"], soundStats["totalSteals"]))
+
+        drawTimes = self.drawTimes
+        lines.append("overlay %.2f ms  redraw %.2f ms" % (sum(drawTimes) / len(drawTimes) if drawTimes else 0.0, self.redrawTime))
+        return lines
+
+    def redraw(self, stage, sounds):
+        '''This method redraws the panel with the current metrics.'''
+        start = time.perf_counter()
+        surface = self.surface
+        surface.fill(PANEL_COLOR)
+
+        top = PADDING
+        for line in self.getLines(stage, sounds):
+            surface.blit(self.text.render(line), (PADDING, top))
+            top += self.text.height
+
+        # Frame times from oldest to newest, with a line at the time of one tick
+        bottom = PANEL_SIZE[1] - PADDING
+        scale = GRAPH_HEIGHT / (self.tickTime * 2)
+        pygame.draw.line(surface, TARGET_COLOR, (PADDING, bottom - int(self.tickTime * scale)), (PADDING + GRAPH_FRAMES * GRAPH_STEP, bottom - int(self.tickTime * scale)))
+        if len(self.frameTimes) > 1:
+            points = [(PADDING + index * GRAPH_STEP, bottom - min(GRAPH_HEIGHT, int(frameTime * scale))) for index, frameTime in enumerate(self.frameTimes)]
+            pygame.draw.lines(surface, GRAPH_COLOR, False, points)
+        self.redrawTime = (time.perf_counter() - start) * 1000
+
+    def clear(self, surface, background):
+        '''This method erases the panel where it was last drawn.'''
+        if self.drawnRect is not None:
+            surface.blit(background, self.drawnRect, self.drawnRect)
+
+    def draw(self, surface, stage, sounds):
+        '''This method records the frame and, if the overlay is shown, draws the panel onto the given Surface. It returns the areas that changed.'''
+        self.recordFrame()
+        changed = [self.drawnRect] if self.drawnRect is not None else []
+        self.drawnRect = None
+        if not self.visible:
+            return changed
+
+        start = time.perf_counter()
+        self.framesSinceRedraw += 1
+        if self.framesSinceRedraw >= REDRAW_INTERVAL:
+            self.redraw(stage, sounds)
+            self.framesSinceRedraw = 0
+        self.drawnRect = surface.blit(self.surface, self.rect)
+        self.drawTimes.append((time.perf_counter() - start) * 1000)
+        return changed + [self.drawnRect]
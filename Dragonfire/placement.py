@@ -0,0 +1,50 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The placement module for the Dragonfire game. Sprites are placed on an occupancy grid whose cells are as big as the largest sprite, so each sprite gets a free cell of its own and a random offset inside it. Placing N sprites takes one pass over the grid no matter how crowded the area is.
+'''
+
+import pygame, random
+
+# Area the treasures of stage two are placed in, matching the range of the original random placement
+TREASURE_AREA = pygame.Rect(10, 31, 530, 338)
+
+
+class PlacementError(ValueError):
+    '''This class defines the error raised when the area is too small to place every sprite without overlap.'''
+
+
+def gridSize(sizes, area):
+    '''This function returns the (cell width, cell height, columns, rows) of the occupancy grid for sprites of the given sizes in the given area.'''
+    cellWidth = max(width for width, height in sizes)
+    cellHeight = max(height for width, height in sizes)
+    return (cellWidth, cellHeight, area.width // cellWidth, area.height // cellHeight)
+
+
+def placeRects(sizes, area, seed=None):
+    '''This function takes a list of (width, height) sizes, the area to place them in, and an optional seed, and returns a list of non-overlapping Rects in the same order. It raises a PlacementError if they can not all fit.'''
+    if not sizes:
+        return []
+    rng = random if seed is None else random.Random(seed)
+
+    # Every cell can hold any of the sprites, so there must be at least one free cell per sprite
+    cellWidth, cellHeight, columns, rows = gridSize(sizes, area)
+    if len(sizes) > columns * rows:
+        raise PlacementError("%d sprites do not fit in %d cells of %dx%d" % (len(sizes), columns * rows, cellWidth, cellHeight))
+
+    # Pick distinct cells, then a random spot inside each one
+    rects = []
+    for (width, height), cell in zip(sizes, rng.sample(range(columns * rows), len(sizes))):
+        column, row = cell % columns, cell // columns
+        left = area.left + column * cellWidth + rng.randint(0, cellWidth - width)
+        top = area.top + row * cellHeight + rng.randint(0, cellHeight - height)
+        rects.append(pygame.Rect(left, top, width, height))
+    return rects
+
+
+def placeSprites(sprites, area, seed=None):
+    '''This function moves each of the given sprites to a spot in the area where it does not overlap any of the others.'''
+    rects = placeRects([sprite.rect.size for sprite in sprites], area, seed)
+    for sprite, rect in zip(sprites, rects):
+        sprite.rect.topleft = rect.topleft
@@ -0,0 +1,85 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The preloader module for the Dragonfire game. A Preloader decodes images and sounds on a worker thread so the game can show a loading screen, and the asset cache only has to wait for the assets that are not ready yet.
+'''
+
+import pygame, threading, time
+
+
+class Preloader:
+    '''This class decodes a list of image and sound files on a background thread and records how long each one took.'''
+    def __init__(self, imageFiles, soundFiles, bundle=None):
+        '''This initializer takes the image and sound file names in the order they should be decoded, and optionally an AssetBundle whose assets do not need decoding.'''
+        # Work list of (file name, is image) pairs
+        self.files = [(fileName, True) for fileName in imageFiles] + [(fileName, False) for fileName in soundFiles]
+
+        # Instance variables
+        self.bundle = bundle
+        self.loaded = {}
+        self.errors = {}
+        self.loadTimes = {}
+        self.ready = dict((fileName, threading.Event()) for fileName, isImage in self.files)
+        self.readyCount = 0
+        self.thread = threading.Thread(target=self.run, name="Preloader", daemon=True)
+
+    def start(self):
+        '''This method starts decoding on the worker thread.'''
+        self.thread.start()
+
+    def run(self):
+        '''This method decodes every file in order. It runs on the worker thread.'''
+        for fileName, isImage in self.files:
+            start = time.perf_counter()
+            try:
+                if isImage:
+                    # Converting to the display format is left to the main thread
+                    if self.bundle is None or not self.bundle.hasImage(fileName):
+                        self.loaded[fileName] = pygame.image.load(fileName)
+                else:
+                    if self.bundle is None or not self.bundle.hasSound(fileName):
+                        self.loaded[fileName] = pygame.mixer.Sound(fileName)
+            except Exception as error:
+                self.errors[fileName] = error
+            self.loadTimes[fileName] = (time.perf_counter() - start) * 1000
+            self.readyCount += 1
+            self.ready[fileName].set()
+
+    def has(self, fileName):
+        '''This method returns True if the given file is on the preloader's list.'''
+        return fileName in self.ready
+
+    def isReady(self, fileNames=None):
+        '''This method returns True if all of the given files, or every file if none are given, have been decoded.'''
+        if fileNames is None:
+            return self.readyCount == len(self.files)
+        for fileName in fileNames:
+            if not self.ready[fileName].is_set():
+                return False
+        return True
+
+    def progress(self):
+        '''This method returns the fraction of files that have been decoded.'''
+        if not self.files:
+            return 1.0
+        return self.readyCount / len(self.files)
+
+    def wait(self, fileName):
+        '''This method blocks until the given file has been decoded and returns it, or None if it is left to the bundle. Decoding errors are raised here on the calling thread.'''
+        self.ready[fileName].wait()
+        if fileName in self.errors:
+            raise self.errors[fileName]
+        return self.loaded.pop(fileName, None)
+
+    def report(self):
+        '''This method returns a list of (file name, milliseconds) pairs for every file decoded so far, slowest first.'''
+        return sorted(self.loadTimes.items(), key=lambda item: item[1], reverse=True)
+
+    def printReport(self):
+        '''This method prints the load time of every file decoded so far.'''
+        total = 0
+        for fileName, milliseconds in self.report():
+            print("%-40s %8.2f ms" % (fileName, milliseconds))
+            total += milliseconds
+        print("%-40s %8.2f ms" % ("total", total))
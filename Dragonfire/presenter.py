@@ -0,0 +1,91 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The presenter module for the Dragonfire game. A Presenter pushes each finished frame to the display, either as a full flip or, in dirty rectangle mode, as only the areas of the screen that changed.
+'''
+
+import pygame
+
+
+def mergeRects(rects):
+    '''This function returns a list of Rects where every group of overlapping Rects has been replaced by their union.'''
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Keep absorbing merged Rects until the current one overlaps none of them
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Presenter:
+    '''This class defines the object that updates the display at the end of every frame and counts the pixels it pushes.'''
+    def __init__(self, screen, dirtyRects=False, fullFlipFraction=0.5, capture=None):
+        '''This initializer takes the screen surface, whether to use dirty rectangle mode, the fraction of the screen above which a full flip is used instead, and a FrameCapture to hand every presented frame to, if any.'''
+        self.screen = screen
+        self.dirtyRects = dirtyRects
+        self.capture = capture
+        self.screenArea = screen.get_width() * screen.get_height()
+        self.fullFlipArea = self.screenArea * fullFlipFraction
+        self.screenRect = screen.get_rect()
+
+        # Instance variables
+        self.rects = []
+        self.fullFrame = True
+        self.framePixels = 0
+        self.totalPixels = 0
+        self.frames = 0
+        self.fullFlips = 0
+
+    def invalidate(self):
+        '''This method makes the next frame a full flip, e.g. after the whole screen has been redrawn.'''
+        self.fullFrame = True
+
+    def addRects(self, rects):
+        '''This method records the Rects that were drawn to this frame, such as the list returned by a RenderUpdates group's draw().'''
+        if self.dirtyRects:
+            self.rects.extend(rects)
+
+    def present(self):
+        '''This method pushes the frame to the display and resets the dirty Rects for the next frame.'''
+        if self.dirtyRects and not self.fullFrame:
+            rects = [rect.clip(self.screenRect) for rect in mergeRects(self.rects)]
+            area = 0
+            for rect in rects:
+                area += rect.width * rect.height
+        else:
+            area = self.fullFlipArea + 1
+
+        # Fall back to a full flip when most of the screen changed anyway
+        if area > self.fullFlipArea:
+            pygame.display.flip()
+            self.framePixels = self.screenArea
+            self.fullFlips += 1
+        else:
+            pygame.display.update(rects)
+            self.framePixels = area
+
+        self.totalPixels += self.framePixels
+        self.frames += 1
+
+        # Hand the finished frame to the capture worker, which copies the whole screen whatever was pushed
+        if self.capture is not None:
+            self.capture.capture(self.screen)
+        self.rects = []
+        self.fullFrame = False
+
+    def getStats(self):
+        '''This method returns a dictionary of the pixel counters.'''
+        averagePixels = 0
+        if self.frames > 0:
+            averagePixels = self.totalPixels / self.frames
+        return {
+            "framePixels": self.framePixels,
+            "averagePixels": averagePixels,
+            "frames": self.frames,
+            "fullFlips": self.fullFlips
+        }
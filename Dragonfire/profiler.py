@@ -0,0 +1,129 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The profiler module for the Dragonfire game. install() wraps each phase of a tick (event handling, fireball spawning, collisions, portals, sprite updates, HUD, clear, draw, and flip) and the update() of every sprite class with a timer. The timings are written as a Chrome trace-event file, which chrome://tracing, Perfetto, and speedscope can all open, along with a summary of where each tick's time went. Nothing is wrapped until install() is called, so the game pays nothing for the profiler when it is off. Running this module profiles a headless game played by a bot.
+'''
+
+import json, sys, time, mySprites, presenter, stages, gameLoop
+
+# Most trace events kept, so a long session can not use up the memory. The summary keeps counting after this.
+MAX_EVENTS = 1000000
+
+# Phase names for the methods of the stages, in the order they run
+STAGE_PHASES = (
+    ("handleEvents", "events"),
+    ("spawnFireballs", "spawn"),
+    ("checkCollisions", "collision"),
+    ("checkPortals", "portals"),
+    ("updateSprites", "update"),
+    ("refreshHud", "hud"),
+    ("clearSprites", "clear"),
+    ("drawSprites", "draw")
+)
+
+# Sprite classes whose update() is timed on its own
+SPRITE_CLASSES = (mySprites.Player, mySprites.Portal, mySprites.Fireball, mySprites.Dragon, mySprites.Treasure, mySprites.ScoreKeeper, mySprites.Life)
+
+# Timed calls as (name, start, duration) in nanoseconds, and the totals for the summary
+events = []
+totals = {}
+calls = {}
+
+# The (class, method name, original method) of everything that was wrapped
+wrapped = []
+
+
+def record(name, start, duration):
+    '''This function adds one timed call to the trace and the totals.'''
+    if len(events) < MAX_EVENTS:
+        events.append((name, start, duration))
+    totals[name] = totals.get(name, 0) + duration
+    calls[name] = calls.get(name, 0) + 1
+
+
+def wrap(cls, methodName, name):
+    '''This function replaces a method of a class with one that times every call under the given name.'''
+    method = cls.__dict__[methodName]
+    clock = time.perf_counter_ns
+
+    def timed(*args, **kwargs):
+        '''This function calls the original method and records how long it took.'''
+        start = clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record(name, start, clock() - start)
+    timed.__wrapped__ = method
+    setattr(cls, methodName, timed)
+    wrapped.append((cls, methodName, method))
+
+
+def install():
+    '''This function starts timing the phases of every tick and the updates of every sprite class.'''
+    if wrapped:
+        return
+    wrap(stages.Game, "tick", "tick")
+    wrap(stages.Game, "render", "render")
+    wrap(stages.Game, "nextStage", "transition")
+    for cls in (stages.Stage, stages.StageOne, stages.StageTwo):
+        for methodName, name in STAGE_PHASES:
+            if methodName in cls.__dict__:
+                wrap(cls, methodName, name)
+    wrap(presenter.Presenter, "present", "flip")
+    for cls in SPRITE_CLASSES:
+        if "update" in cls.__dict__:
+            wrap(cls, "update", "update:" + cls.__name__)
+
+
+def uninstall():
+    '''This function puts back every method that install() wrapped.'''
+    while wrapped:
+        cls, methodName, method = wrapped.pop()
+        setattr(cls, methodName, method)
+
+
+def clear():
+    '''This function forgets every timing recorded so far.'''
+    del events[:]
+    totals.clear()
+    calls.clear()
+
+
+def summary():
+    '''This function returns a list of (name, calls, total ms, ms per tick, percent of tick and render time) for every timed name, slowest first.'''
+    ticks = calls.get("tick", 0) or 1
+    frameTime = totals.get("tick", 0) + totals.get("render", 0) or 1
+    rows = []
+    for name, total in sorted(totals.items(), key=lambda item: -item[1]):
+        rows.append((name, calls[name], total / 1e6, total / 1e6 / ticks, 100 * total / frameTime))
+    return rows
+
+
+def printSummary():
+    '''This function prints where the time of an average tick went.'''
+    print("%-22s %9s %11s %10s %7s" % ("phase", "calls", "total ms", "ms/tick", "share"))
+    for name, count, total, perTick, share in summary():
+        print("%-22s %9d %11.2f %10.4f %6.1f%%" % (name, count, total, perTick, share))
+
+    # Compare an average tick and render with the time one frame has at the game's tick rate
+    if calls.get("tick") and calls.get("render"):
+        print("%.3f ms per tick and %.3f ms per render, out of %.1f ms per frame" % (totals["tick"] / 1e6 / calls["tick"], totals["render"] / 1e6 / calls["render"], 1000 / gameLoop.TICK_RATE))
+
+
+def save(fileName):
+    '''This function writes the recorded calls as a Chrome trace-event file. Calls that happened inside another one are shown nested below it.'''
+    origin = min(start for name, start, duration in events) if events else 0
+    traceEvents = [{"name": name, "cat": name.split(":")[0], "ph": "X", "ts": (start - origin) / 1000, "dur": duration / 1000, "pid": 1, "tid": 1} for name, start, duration in events]
+    traceFile = open(fileName, "w")
+    json.dump({"traceEvents": traceEvents, "displayTimeUnit": "ms"}, traceFile)
+    traceFile.close()
+
+
+if __name__ == "__main__":
+    import bots, headless
+    install()
+    simulation = headless.Simulation(bots.playerBot, seed=0, render=True)
+    simulation.step(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+    save(sys.argv[1] if len(sys.argv) > 1 else "profile.json")
+    printSummary()
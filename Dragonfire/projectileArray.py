@@ -0,0 +1,262 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The projectile array module for the Dragonfire game. A ProjectileArray keeps every live fireball in NumPy arrays instead of Fireball sprites, so moving, culling, and testing them against the player take a few array operations per frame no matter how many there are. It has the same methods as FireballPool, so the stages can use either. Running this module prints a stress test comparing the two.
+'''
+
+import pygame, time, atlas, collision
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Fireball kinds, which pick the animation frames and size
+SIDE = 0
+UP = 1
+
+# Ticks each animation frame is shown for, matching FIREBALL_ANIMATIONS in mySprites
+FRAME_TICKS = 3
+
+
+def roundRect(values):
+    '''This function rounds coordinates half away from zero, the same way pygame stores floats in a Rect.'''
+    return numpy.trunc(values + numpy.copysign(0.5, values))
+
+
+class ProjectileArray:
+    '''This class defines a fixed-capacity set of fireballs stored as a struct of NumPy arrays. Live fireballs are packed at the start of the arrays.'''
+    def __init__(self, capacity):
+        '''This initializer takes the most fireballs that may be alive at once.'''
+        if numpy is None:
+            raise ImportError("ProjectileArray requires numpy")
+
+        # Animation frames of both kinds, indexed by kind * 2 + frame
+        frames = atlas.loadFrames("fireball")
+        self.images = [frames["sideFireball1"], frames["sideFireball2"], frames["upFireball1"], frames["upFireball2"]]
+        self.sizes = numpy.array([frames["sideFireball1"].get_size(), frames["upFireball1"].get_size()], dtype=numpy.float64)
+
+        # Struct of arrays: position, position before the last update, velocity, end bound, animation phase, and kind
+        self.capacity = capacity
+        self.count = 0
+        self.x = numpy.zeros(capacity)
+        self.y = numpy.zeros(capacity)
+        self.previousX = numpy.zeros(capacity)
+        self.previousY = numpy.zeros(capacity)
+        self.dx = numpy.zeros(capacity)
+        self.dy = numpy.zeros(capacity)
+        self.endX = numpy.zeros(capacity)
+        self.endY = numpy.zeros(capacity)
+        self.phase = numpy.zeros(capacity, dtype=numpy.int64)
+        self.kind = numpy.zeros(capacity, dtype=numpy.int64)
+        self.arrays = (self.x, self.y, self.previousX, self.previousY, self.dx, self.dy, self.endX, self.endY, self.phase, self.kind)
+
+        # Positions that passed the rect test and were checked against the masks on the last collide()
+        self.narrowTests = 0
+
+        # Rects drawn on the last frame, which are erased by clear()
+        self.drawnRects = []
+
+        # Metrics
+        self.spawns = 0
+        self.exhausted = 0
+        self.peak = 0
+
+    def attach(self, stageScene):
+        '''This method does nothing. Fireballs in the array are not part of any Scene.'''
+
+    def spawn(self, stage, direction, level):
+        '''This method takes the stage, direction, and level of a new fireball, the same as Fireball.reset(), and returns True if there was room for it.'''
+        if self.count == self.capacity:
+            self.exhausted += 1
+            return False
+        index = self.count
+
+        # Spawn in the specified location with the same vectors as a Fireball sprite
+        start, end = direction
+        if stage == 1:
+            kind = SIDE
+            if start[1] == end[1] == 305:
+                dx = ((end[0] - start[0]) / 70) + level
+                dy = ((end[1] - start[1]) / 70)
+            else:
+                dx = ((end[0] - start[0]) / 30) + level
+                dy = ((end[1] - start[1]) / 30)
+            # Side fireballs only end on the right
+            endX, endY = end[0], -numpy.inf
+        else:
+            kind = UP
+            dx = 0
+            dy = -7 - level
+            # Upward fireballs only end at the top
+            endX, endY = numpy.inf, end[1]
+
+        self.x[index] = self.previousX[index] = start[0]
+        self.y[index] = self.previousY[index] = start[1] - self.sizes[kind][1]
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.endX[index] = endX
+        self.endY[index] = endY
+        self.phase[index] = 0
+        self.kind[index] = kind
+
+        self.count += 1
+        self.spawns += 1
+        self.peak = max(self.peak, self.count)
+        return True
+
+    def removeWhere(self, dead):
+        '''This method drops the fireballs flagged in the given boolean array and packs the survivors at the start of the arrays.'''
+        keep = ~dead
+        survivors = int(keep.sum())
+        if survivors != self.count:
+            for values in self.arrays:
+                values[:survivors] = values[:self.count][keep]
+            self.count = survivors
+
+    def update(self):
+        '''This method moves every fireball, removes the ones that reached the end of their path, and advances their animation.'''
+        count = self.count
+        if count == 0:
+            return
+        x = self.x[:count]
+        y = self.y[:count]
+        self.previousX[:count] = x
+        self.previousY[:count] = y
+        x += self.dx[:count]
+        y += self.dy[:count]
+        x[:] = roundRect(x)
+        y[:] = roundRect(y)
+        self.removeWhere((x >= self.endX[:count]) | (y <= self.endY[:count]))
+        self.phase[:self.count] += 1
+
+    def collide(self, player):
+        '''This method removes every fireball whose visible pixels touch the player's and returns how many there were. The rect test runs on the whole array and only its hits are checked against the masks.'''
+        count = self.count
+        if count == 0:
+            return 0
+        rect = player.rect
+        x = self.x[:count]
+        y = self.y[:count]
+        size = self.sizes[self.kind[:count]]
+        hits = (x < rect.right) & (x + size[:, 0] > rect.left) & (y < rect.bottom) & (y + size[:, 1] > rect.top)
+        candidates = numpy.flatnonzero(hits)
+        self.narrowTests = len(candidates)
+        if self.narrowTests == 0:
+            return 0
+
+        # Narrow phase against the mask of the frame each fireball is showing
+        frame = self.kind[candidates] * 2 + (self.phase[candidates] // FRAME_TICKS) % 2
+        for index, frameIndex in zip(candidates.tolist(), frame.tolist()):
+            if not collision.masksOverlap(player.image, rect.topleft, self.images[frameIndex], (self.x[index], self.y[index])):
+                hits[index] = False
+        hitCount = int(hits.sum())
+        if hitCount:
+            self.removeWhere(hits)
+        return hitCount
+
+    def clear(self, surface, background):
+        '''This method erases the fireballs drawn on the last frame.'''
+        blit = surface.blit
+        for rect in self.drawnRects:
+            blit(background, rect, rect)
+
+    def draw(self, surface, alpha=1.0):
+        '''This method draws every fireball in one batched blit and returns the Rects that changed. An alpha below 1 draws them that far between their last two positions.'''
+        count = self.count
+        frame = self.kind[:count] * 2 + (self.phase[:count] // FRAME_TICKS) % 2
+        x = self.x[:count]
+        y = self.y[:count]
+        if alpha < 1.0:
+            x = roundRect(self.previousX[:count] + (x - self.previousX[:count]) * alpha)
+            y = roundRect(self.previousY[:count] + (y - self.previousY[:count]) * alpha)
+        images = self.images
+        blits = [(images[index], (left, top)) for index, left, top in zip(frame.tolist(), x.tolist(), y.tolist())]
+        dirty = self.drawnRects
+        self.drawnRects = surface.blits(blits)
+        return dirty + self.drawnRects
+
+    def positions(self):
+        '''This method returns the sorted top left corners of the live fireballs, the same as FireballPool.positions().'''
+        return sorted(zip(self.x[:self.count].astype(numpy.int64).tolist(), self.y[:self.count].astype(numpy.int64).tolist()))
+
+    def releaseAll(self):
+        '''This method removes every fireball, e.g. when a stage ends.'''
+        self.count = 0
+        self.drawnRects = []
+
+    def getState(self):
+        '''This method returns the sorted state of the live fireballs as (stage, left, top, dx, dy, end, phase) tuples, the same as FireballPool.getState().'''
+        states = []
+        for index in range(self.count):
+            kind = int(self.kind[index])
+            end = self.endX[index] if kind == SIDE else self.endY[index]
+            states.append((kind + 1, int(self.x[index]), int(self.y[index]), float(self.dx[index]), float(self.dy[index]), int(end), int(self.phase[index]) % (2 * FRAME_TICKS)))
+        return sorted(states)
+
+    def setState(self, states):
+        '''This method replaces the live fireballs with ones in the given states, as returned by getState().'''
+        self.releaseAll()
+        for stage, left, top, dx, dy, end, phase in states:
+            self.spawn(stage, ((left, top), (end, end)), 0)
+            index = self.count - 1
+            self.x[index] = self.previousX[index] = left
+            self.y[index] = self.previousY[index] = top
+            self.dx[index] = dx
+            self.dy[index] = dy
+            self.phase[index] = phase
+
+    def getStats(self):
+        '''This method returns a dictionary of the array metrics.'''
+        return {
+            "active": self.count,
+            "free": self.capacity - self.count,
+            "allocated": self.capacity,
+            "peak": self.peak,
+            "spawns": self.spawns,
+            "exhausted": self.exhausted
+        }
+
+
+def stressTest(fireballs, stageScene, screen, background, player, counts, frames=100):
+    '''This function keeps the given number of fireballs alive for a number of frames with each count and returns the average milliseconds per frame for each.'''
+    results = []
+    for count in counts:
+        fireballs.releaseAll()
+        elapsed = 0
+        for frame in range(frames):
+            # Top the fireballs up, spread down the screen so they keep flying
+            while fireballs.getStats()["active"] < count:
+                row = fireballs.spawns % 400
+                fireballs.spawn(1, ((0, 20 + row), (620, 20 + row)), 0)
+            start = time.perf_counter()
+            fireballs.collide(player)
+            stageScene.clear(screen, background)
+            fireballs.clear(screen, background)
+            stageScene.update()
+            fireballs.update()
+            stageScene.draw(screen)
+            fireballs.draw(screen)
+            elapsed += time.perf_counter() - start
+        results.append(elapsed * 1000 / frames)
+    fireballs.releaseAll()
+    return results
+
+
+if __name__ == "__main__":
+    import fireballPool, mySprites, scene
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+    background = pygame.Surface(screen.get_size()).convert()
+    player = mySprites.Player(screen, 1, (600, 470))
+    counts = (10, 50, 100, 200, 400)
+
+    print("%-10s %12s %12s" % ("fireballs", "pool ms", "array ms"))
+    pool = fireballPool.FireballPool(max(counts))
+    poolScene = scene.Scene()
+    pool.attach(poolScene)
+    poolTimes = stressTest(pool, poolScene, screen, background, player, counts)
+    arrayTimes = stressTest(ProjectileArray(max(counts)), scene.Scene(), screen, background, player, counts)
+    for count, poolTime, arrayTime in zip(counts, poolTimes, arrayTimes):
+        print("%-10d %12.3f %12.3f" % (count, poolTime, arrayTime))
@@ -0,0 +1,204 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The replay module for the Dragonfire game. A Recorder wraps an input source and logs the keys of every tick along with the seed of the game's random numbers and a checksum of the game state every so often. A ReplayInput feeds a recording back through the same loop and checks the state against the recorded checksums, so one replay is both a correctness test and a repeatable benchmark. Running this module replays a file headless as fast as possible.
+'''
+
+import pygame, random, struct, sys, time, zlib, inputSource
+
+# File signature and header layout: signature, seed, starting lives, ticks, and number of checksums
+SIGNATURE = b"DFREPLY1"
+HEADER = struct.Struct("<8sIIII")
+CHECKSUM = struct.Struct("<II")
+
+# Keys the stages respond to, stored as their index in this tuple
+RECORDED_KEYS = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+KEY_INDEX = dict((key, index) for index, key in enumerate(RECORDED_KEYS))
+
+# Layout of one tick: held keys as a bit mask and the number of events, followed by one byte per event
+TICK = struct.Struct("<HB")
+KEY_DOWN_FLAG = 0x80
+QUIT_CODE = 0x7F
+
+# Ticks between state checksums
+CHECKSUM_INTERVAL = 30
+
+
+class ReplayMismatch(ValueError):
+    '''This class defines the error raised when a replayed game does not match the checksums of its recording.'''
+
+
+def stateChecksum(game):
+    '''This function returns a checksum of the state of a Game that any difference in the game logic would change.'''
+    stage = game.stage
+    player = stage.player
+    state = (
+        game.stageNumber, game.level, game.frames, stage.frames, stage.scoreKeeper.score, stage.livesRemaining, stage.keepGoing,
+        tuple(player.rect), player.dx, player.dy, player.directionFacing, player.crouched, stage.allSprites.isVisible(player),
+        getattr(stage, "topFireballCounter", None), getattr(stage, "bottomFireballCounter", None), getattr(stage, "fireballCooldown", None), getattr(stage, "treasuresRemaining", None),
+        tuple(stage.dragon.rect) if hasattr(stage, "dragon") else None,
+        tuple(game.runtime.fireballs.positions())
+    )
+    return zlib.crc32(repr(state).encode())
+
+
+def encodeTick(events, keysPressed):
+    '''This function packs the events and held keys of one tick into bytes. Keys the stages ignore are left out.'''
+    held = 0
+    for index, key in enumerate(RECORDED_KEYS):
+        if keysPressed[key]:
+            held |= 1 << index
+    codes = bytearray()
+    for event in events:
+        if event.type == pygame.QUIT:
+            codes.append(QUIT_CODE)
+        elif event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in KEY_INDEX:
+            code = KEY_INDEX[event.key]
+            if event.type == pygame.KEYDOWN:
+                code |= KEY_DOWN_FLAG
+            codes.append(code)
+    return TICK.pack(held, len(codes)) + bytes(codes)
+
+
+def decodeTicks(data):
+    '''This function unpacks a stream of ticks into a list of (events, KeyState) pairs.'''
+    ticks = []
+    offset = 0
+    while offset < len(data):
+        held, count = TICK.unpack_from(data, offset)
+        offset += TICK.size
+        events = []
+        for code in data[offset:offset + count]:
+            if code == QUIT_CODE:
+                events.append(pygame.event.Event(pygame.QUIT))
+            elif code & KEY_DOWN_FLAG:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=RECORDED_KEYS[code & ~KEY_DOWN_FLAG]))
+            else:
+                events.append(pygame.event.Event(pygame.KEYUP, key=RECORDED_KEYS[code]))
+        offset += count
+        ticks.append((events, inputSource.KeyState(key for index, key in enumerate(RECORDED_KEYS) if held & (1 << index))))
+    return ticks
+
+
+class Recording:
+    '''This class defines a recorded game: the seed, starting lives, the input of every tick, and the state checksums.'''
+    def __init__(self, seed, lives, ticks=None, checksums=None):
+        '''This initializer takes the seed and starting lives, and optionally the encoded ticks and a dictionary of checksums by tick.'''
+        self.seed = seed
+        self.lives = lives
+        self.ticks = ticks or []
+        self.checksums = checksums or {}
+
+    def save(self, fileName):
+        '''This method writes the recording to a file. The ticks are compressed, so long stretches of the same input take almost no space.'''
+        recordFile = open(fileName, "wb")
+        recordFile.write(HEADER.pack(SIGNATURE, self.seed, self.lives, len(self.ticks), len(self.checksums)))
+        for tick in sorted(self.checksums):
+            recordFile.write(CHECKSUM.pack(tick, self.checksums[tick]))
+        recordFile.write(zlib.compress(b"".join(self.ticks), 9))
+        recordFile.close()
+
+
+def load(fileName):
+    '''This function reads a recording from a file and returns it with its ticks decoded.'''
+    recordFile = open(fileName, "rb")
+    data = recordFile.read()
+    recordFile.close()
+
+    signature, seed, lives, tickCount, checksumCount = HEADER.unpack_from(data, 0)
+    if signature != SIGNATURE:
+        raise ValueError("%s is not a Dragonfire replay" % fileName)
+    offset = HEADER.size
+    checksums = {}
+    for number in range(checksumCount):
+        tick, checksum = CHECKSUM.unpack_from(data, offset)
+        checksums[tick] = checksum
+        offset += CHECKSUM.size
+    ticks = decodeTicks(zlib.decompress(data[offset:]))
+    if len(ticks) != tickCount:
+        raise ValueError("%s is truncated" % fileName)
+    return Recording(seed, lives, ticks, checksums)
+
+
+def newSeed():
+    '''This function returns a new random seed for a recorded game.'''
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+class Recorder:
+    '''This class defines an input source that passes on the input of another source and records it.'''
+    def __init__(self, source, seed, lives=7, checksumInterval=CHECKSUM_INTERVAL):
+        '''This initializer takes the input source to record, the seed the game's random numbers were seeded with, the starting lives, and the ticks between checksums.'''
+        self.source = source
+        self.recording = Recording(seed, lives)
+        self.checksumInterval = checksumInterval
+
+    def poll(self, game):
+        '''This method returns the events and held keys of the source, recording them and, every so often, a checksum of the state they are applied to.'''
+        tick = len(self.recording.ticks)
+        if tick % self.checksumInterval == 0:
+            self.recording.checksums[tick] = stateChecksum(game)
+        events, keysPressed = self.source.poll(game)
+        self.recording.ticks.append(encodeTick(events, keysPressed))
+        return events, keysPressed
+
+    def save(self, fileName, game):
+        '''This method adds a checksum of the final state and writes the recording to a file.'''
+        self.recording.checksums[len(self.recording.ticks)] = stateChecksum(game)
+        self.recording.save(fileName)
+
+
+class ReplayInput:
+    '''This class defines an input source that plays back a recording and compares the game state with its checksums. The window is closed once the recording runs out.'''
+    def __init__(self, recording, strict=False):
+        '''This initializer takes the recording and whether a checksum that does not match raises a ReplayMismatch instead of only being counted.'''
+        self.recording = recording
+        self.strict = strict
+        self.tick = 0
+        self.verified = 0
+        self.mismatches = []
+
+    def verify(self, game):
+        '''This method compares the game state with the checksum recorded for the current tick, if there is one.'''
+        expected = self.recording.checksums.get(self.tick)
+        if expected is None:
+            return
+        if stateChecksum(game) == expected:
+            self.verified += 1
+        else:
+            self.mismatches.append(self.tick)
+            if self.strict:
+                raise ReplayMismatch("Game state differs from the recording at tick %d" % self.tick)
+
+    def poll(self, game):
+        '''This method returns the recorded events and held keys of the current tick. Closing the window stops the playback.'''
+        self.verify(game)
+        closed = any(event.type == pygame.QUIT for event in pygame.event.get())
+        if closed or self.tick >= len(self.recording.ticks):
+            return [pygame.event.Event(pygame.QUIT)], inputSource.KeyState(())
+        events, keysPressed = self.recording.ticks[self.tick]
+        self.tick += 1
+        return events, keysPressed
+
+    def finish(self, game):
+        '''This method checks the final state of the game and returns True if every checksum matched and the game lasted as long as the recording.'''
+        self.verify(game)
+        if self.tick != len(self.recording.ticks) and self.tick not in self.mismatches:
+            self.mismatches.append(self.tick)
+        return not self.mismatches
+
+
+if __name__ == "__main__":
+    import headless
+    recording = load(sys.argv[1])
+    source = ReplayInput(recording)
+    simulation = headless.Simulation(source=source, seed=recording.seed, lives=recording.lives, projectiles=sys.argv[2] if len(sys.argv) > 2 else "pool")
+    start = time.perf_counter()
+    while simulation.step(1000):
+        pass
+    elapsed = time.perf_counter() - start
+    matched = source.finish(simulation.game)
+    print("%d ticks in %.3f s (%.0f ticks per second)" % (simulation.game.frames, elapsed, simulation.game.frames / elapsed))
+    print("%d checksums matched, %d did not%s" % (source.verified, len(source.mismatches), ", first at tick %d" % source.mismatches[0] if source.mismatches else ""))
+    sys.exit(0 if matched else 1)
@@ -0,0 +1,40 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The runtime module for the Dragonfire game. A Runtime holds the services every stage needs, such as the screen, the sound bank, and where input comes from, so the same stages can run in the game window or headless.
+'''
+
+import fireballPool, projectileArray
+
+# Sound effects and how many of each may play at the same time
+SOUND_EFFECTS = {
+    "death": ("soundEffects/death.ogg", 1),
+    "fireball": ("soundEffects/fireball.ogg", 3),
+    "treasure": ("soundEffects/ding.ogg", 2)
+}
+
+# Most fireballs that can be alive at once
+FIREBALL_CAP = 32
+
+
+def createFireballs(engine="pool", cap=FIREBALL_CAP):
+    '''This function returns the fireballs for the given engine and cap: "array" keeps them in NumPy arrays if NumPy is installed, anything else reuses them from a pool.'''
+    if engine == "array" and projectileArray.numpy is not None:
+        return projectileArray.ProjectileArray(cap)
+    return fireballPool.FireballPool(cap)
+
+
+class Runtime:
+    '''This class defines the services shared by the stages of one game.'''
+    def __init__(self, screen, sounds, display, fireballs, inputSource, render=True, interpolate=False, overlay=None, rewind=None):
+        '''This initializer takes the screen Surface, SoundBank, Presenter, fireballs, and input source. If render is False the stages skip drawing and presenting frames, and if interpolate is True sprites can be drawn between ticks. An overlay, if given, is drawn over every frame, and a RewindBuffer, if given, keeps a snapshot of every tick.'''
+        self.screen = screen
+        self.sounds = sounds
+        self.display = display
+        self.fireballs = fireballs
+        self.input = inputSource
+        self.render = render
+        self.interpolate = interpolate
+        self.overlay = overlay
+        self.rewind = rewind
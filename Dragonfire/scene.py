@@ -0,0 +1,165 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The scene module for the Dragonfire game. A Scene is a sprite group with fixed draw layers and a visibility flag for every sprite, so sprites can be hidden and shown without being removed from the group or changing the draw order.
+'''
+
+import pygame
+
+# Draw layers, from back to front
+BACKGROUND = 0
+PICKUPS = 1
+ACTORS = 2
+PROJECTILES = 3
+HUD = 4
+LAYERS = (BACKGROUND, PICKUPS, ACTORS, PROJECTILES, HUD)
+
+# Layers drawn once into the StaticLayer instead of every frame
+STATIC_LAYERS = (HUD,)
+
+# Sprites that moved further than this in one update jumped there, so they are not drawn in between
+TELEPORT_DISTANCE = 64
+
+
+class Scene(pygame.sprite.AbstractGroup):
+    '''This class defines a sprite group that draws its sprites layer by layer and skips hidden sprites. Like RenderUpdates, draw() returns the Rects that changed.'''
+    def __init__(self):
+        '''This initializer creates an empty scene.'''
+        # Call the parent __init__() method
+        pygame.sprite.AbstractGroup.__init__(self)
+
+        # Each layer is a dictionary used as an ordered set, so adding and removing take constant time
+        self.layers = [{} for layer in LAYERS]
+        self.dynamicLayers = [self.layers[layer] for layer in LAYERS if layer not in STATIC_LAYERS]
+        self.layerOf = {}
+        self.hidden = set()
+
+        # Increased whenever a sprite on a static layer is added, removed, shown or hidden
+        self.staticVersion = 0
+
+        # Where each sprite was before the last update, kept only if interpolation is turned on
+        self.interpolate = False
+        self.previous = {}
+
+    def add(self, *sprites, layer=ACTORS):
+        '''This method adds sprites, or lists of sprites, to the given layer.'''
+        for sprite in sprites:
+            if isinstance(sprite, pygame.sprite.Sprite):
+                if not self.has_internal(sprite):
+                    self.add_internal(sprite, layer)
+                    sprite.add_internal(self)
+            else:
+                self.add(*sprite, layer=layer)
+
+    def add_internal(self, sprite, layer=None):
+        '''This method adds a sprite to the scene internally. It is called by pygame.'''
+        if layer is None:
+            layer = ACTORS
+        pygame.sprite.AbstractGroup.add_internal(self, sprite)
+        self.layers[layer][sprite] = None
+        self.layerOf[sprite] = layer
+        if layer in STATIC_LAYERS:
+            self.staticVersion += 1
+
+    def remove_internal(self, sprite):
+        '''This method removes a sprite from the scene internally. It is called by pygame, e.g. when a sprite is killed.'''
+        pygame.sprite.AbstractGroup.remove_internal(self, sprite)
+        layer = self.layerOf.pop(sprite)
+        del self.layers[layer][sprite]
+        self.hidden.discard(sprite)
+        self.previous.pop(sprite, None)
+        if layer in STATIC_LAYERS:
+            self.staticVersion += 1
+
+    def sprites(self):
+        '''This method returns a list of every sprite in the scene, visible or not, in draw order.'''
+        sprites = []
+        for layer in self.layers:
+            sprites.extend(layer)
+        return sprites
+
+    def isVisible(self, sprite):
+        '''This method returns True if the sprite is in the scene and has not been hidden.'''
+        return sprite in self.layerOf and sprite not in self.hidden
+
+    def hide(self, sprite):
+        '''This method stops drawing and updating a sprite without removing it from the scene. The area it was last drawn in is cleared on the next frame.'''
+        if sprite in self.hidden:
+            return
+        self.hidden.add(sprite)
+        lostRect = self.spritedict[sprite]
+        if lostRect:
+            self.lostsprites.append(lostRect)
+            self.spritedict[sprite] = None
+        if self.layerOf[sprite] in STATIC_LAYERS:
+            self.staticVersion += 1
+
+    def show(self, sprite):
+        '''This method makes a hidden sprite visible again.'''
+        if sprite in self.hidden:
+            self.hidden.remove(sprite)
+            if self.layerOf[sprite] in STATIC_LAYERS:
+                self.staticVersion += 1
+
+    def update(self, *args, **kwargs):
+        '''This method calls update() on every visible sprite of the dynamic layers.'''
+        hidden = self.hidden
+        previous = self.previous
+        for layer in self.dynamicLayers:
+            for sprite in list(layer):
+                if sprite not in hidden:
+                    if self.interpolate:
+                        previous[sprite] = sprite.rect.topleft
+                    sprite.update(*args, **kwargs)
+
+    def position(self, sprite, alpha):
+        '''This method returns where to draw a sprite that is alpha of the way from its position before the last update to its current one.'''
+        rect = sprite.rect
+        last = self.previous.get(sprite)
+        if last is None:
+            return rect.topleft
+        dx = rect.left - last[0]
+        dy = rect.top - last[1]
+        if abs(dx) > TELEPORT_DISTANCE or abs(dy) > TELEPORT_DISTANCE:
+            return rect.topleft
+        return (round(last[0] + dx * alpha), round(last[1] + dy * alpha))
+
+    def draw(self, surface, alpha=1.0):
+        '''This method draws every visible sprite of the dynamic layers and returns a list of the Rects that changed. An alpha below 1 draws the sprites that far between their last two positions.'''
+        spritedict = self.spritedict
+        hidden = self.hidden
+        interpolate = alpha < 1.0
+        dirty = self.lostsprites
+        self.lostsprites = []
+        for layer in self.dynamicLayers:
+            for sprite in layer:
+                if sprite in hidden:
+                    continue
+                oldRect = spritedict[sprite]
+                if interpolate:
+                    newRect = surface.blit(sprite.image, self.position(sprite, alpha))
+                else:
+                    newRect = surface.blit(sprite.image, sprite.rect)
+                if oldRect:
+                    if newRect.colliderect(oldRect):
+                        dirty.append(newRect.union(oldRect))
+                    else:
+                        dirty.append(newRect)
+                        dirty.append(oldRect)
+                else:
+                    dirty.append(newRect)
+                spritedict[sprite] = newRect
+        return dirty
+
+    def updateLayer(self, layer):
+        '''This method calls update() on every visible sprite of a single layer.'''
+        for sprite in list(self.layers[layer]):
+            if sprite not in self.hidden:
+                sprite.update()
+
+    def drawLayer(self, surface, layer):
+        '''This method draws every visible sprite of a single layer without keeping track of where it was drawn.'''
+        for sprite in self.layers[layer]:
+            if sprite not in self.hidden:
+                surface.blit(sprite.image, sprite.rect)
@@ -0,0 +1,358 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The snapshot module for the Dragonfire game. A snapshot packs the complete state of a Game's current stage, from the player's animation frame to every live fireball, into a compact binary record that restore() puts back exactly, so the game carries on tick for tick as it would have. A RewindBuffer keeps the snapshots of the last few seconds in one preallocated ring of fixed size, so holding Backspace steps back in time without allocating anything while the game runs. Running this module measures what a snapshot costs in a headless game played by a bot.
+'''
+
+import pygame, random, struct, sys, time, gameLoop, mySprites, runtime, scene
+
+# Record layout, all little-endian. A record starts with the flags and the game, then the stage, the player, the parts only one stage has, and the fireballs.
+FLAGS = struct.Struct("<B")
+GAME = struct.Struct("<BHBIB?I")
+STAGE = struct.Struct("<??IIB")
+PLAYER = struct.Struct("<hhhhB??BBBH")
+STAGE_ONE = struct.Struct("<hh")
+STAGE_TWO = struct.Struct("<??BBhhB?BBBHB")
+TREASURE = struct.Struct("<Bhh?")
+FIREBALL_COUNT = struct.Struct("<H")
+FIREBALL = struct.Struct("<BhhddhB")
+
+# The state of the random numbers: the 625 words of the generator and the spare Gaussian, if there is one
+RANDOM = struct.Struct("<625Id?")
+
+# Flags of a record
+WITH_RANDOM = 1
+
+# Animation states are stored as their index in these tuples
+PLAYER_STATES = tuple(mySprites.PLAYER_ANIMATIONS)
+DRAGON_STATES = tuple(mySprites.DRAGON_ANIMATIONS)
+
+# Treasures in the second stage
+TREASURES = 10
+
+# Key that rewinds, how far each press goes back, and how much a RewindBuffer keeps by default
+REWIND_KEY = pygame.K_BACKSPACE
+REWIND_SECONDS = 1
+DEFAULT_SECONDS = 10
+
+
+def recordSize(fireballCap, withRandom=True):
+    '''This function returns the most bytes a record can take with the given number of fireballs.'''
+    size = FLAGS.size + GAME.size + STAGE.size + PLAYER.size + max(STAGE_ONE.size, STAGE_TWO.size + TREASURES * TREASURE.size) + FIREBALL_COUNT.size + fireballCap * FIREBALL.size
+    if withRandom:
+        size += RANDOM.size
+    return size
+
+
+def writeRecord(game, buffer, offset=0, withRandom=True, fireballCap=None):
+    '''This function packs the state of a Game into the buffer at the given offset and returns the offset after the record. If a fireball cap is given, a record with more fireballs than that raises a ValueError instead of running past its space.'''
+    stage = game.stage
+    fireballStates = game.runtime.fireballs.getState()
+    if fireballCap is not None and len(fireballStates) > fireballCap:
+        raise ValueError("%d fireballs do not fit in a snapshot of %d" % (len(fireballStates), fireballCap))
+
+    FLAGS.pack_into(buffer, offset, WITH_RANDOM if withRandom else 0)
+    offset += FLAGS.size
+    GAME.pack_into(buffer, offset, game.stageNumber, game.level, game.levelCounter, game.score, game.lives, game.endGame, game.frames)
+    offset += GAME.size
+    STAGE.pack_into(buffer, offset, stage.keepGoing, stage.endGame, stage.frames, stage.scoreKeeper.score, stage.livesRemaining)
+    offset += STAGE.size
+
+    player = stage.player
+    animation = player.animation
+    PLAYER.pack_into(buffer, offset, player.rect.left, player.rect.top, player.dx, player.dy, player.directionFacing, player.crouched, stage.allSprites.isVisible(player), PLAYER_STATES.index(animation.state), animation.index, animation.ticks, animation.cycles)
+    offset += PLAYER.size
+
+    if game.stageNumber == 1:
+        STAGE_ONE.pack_into(buffer, offset, stage.topFireballCounter, stage.bottomFireballCounter)
+        offset += STAGE_ONE.size
+    else:
+        dragon = stage.dragon
+        animation = dragon.animation
+        STAGE_TWO.pack_into(buffer, offset, stage.startPortal.open, stage.visibleEndPortal, stage.treasuresRemaining, stage.fireballCooldown, dragon.rect.left, dragon.dx, dragon.directionFacing, dragon.shooting, DRAGON_STATES.index(animation.state), animation.index, animation.ticks, animation.cycles, len(stage.treasures))
+        offset += STAGE_TWO.size
+        allSprites = stage.allSprites
+        for treasure in stage.treasures:
+            TREASURE.pack_into(buffer, offset, treasure.value, treasure.rect.left, treasure.rect.top, allSprites.has_internal(treasure))
+            offset += TREASURE.size
+
+    FIREBALL_COUNT.pack_into(buffer, offset, len(fireballStates))
+    offset += FIREBALL_COUNT.size
+    for state in fireballStates:
+        FIREBALL.pack_into(buffer, offset, *state)
+        offset += FIREBALL.size
+
+    if withRandom:
+        offset = writeRandomState(random.getstate(), buffer, offset)
+    return offset
+
+
+def writeRandomState(state, buffer, offset):
+    '''This function packs a state returned by random.getstate() into the buffer and returns the offset after it.'''
+    version, words, gauss = state
+    RANDOM.pack_into(buffer, offset, *words, gauss or 0.0, gauss is not None)
+    return offset + RANDOM.size
+
+
+def readRandomState(data, offset):
+    '''This function unpacks a state for random.setstate() from the data.'''
+    values = RANDOM.unpack_from(data, offset)
+    return (3, values[:625], values[625] if values[626] else None)
+
+
+def capture(game, withRandom=True):
+    '''This function returns a snapshot of a Game as bytes, with the state of the random numbers unless withRandom is False.'''
+    buffer = bytearray(recordSize(len(game.runtime.fireballs.getState()), withRandom))
+    return bytes(buffer[:writeRecord(game, buffer, 0, withRandom)])
+
+
+def restoreAnimation(sprite, states, stateIndex, index, ticks, cycles):
+    '''This function puts a sprite's Animation back in the given state, frame, and tick, and shows that frame.'''
+    animation = sprite.animation
+    animation.restart(states[stateIndex])
+    animation.index = index
+    animation.ticks = ticks
+    animation.cycles = cycles
+    animation.image = sprite.image = animation.table[index][0]
+
+
+def restore(game, data, offset=0):
+    '''This function puts a Game back in the state of a snapshot made by capture() or a RewindBuffer, entering the stage of the snapshot first if it is not the current one. It returns the offset after the record.'''
+    flags, = FLAGS.unpack_from(data, offset)
+    offset += FLAGS.size
+    stageNumber, level, levelCounter, score, lives, endGame, frames = GAME.unpack_from(data, offset)
+    offset += GAME.size
+    keepGoing, stageEnd, stageFrames, stageScore, livesRemaining = STAGE.unpack_from(data, offset)
+    offset += STAGE.size
+
+    # Switch to the stage of the snapshot, keeping the random numbers entering it would draw
+    gameRuntime = game.runtime
+    if game.stageNumber != stageNumber:
+        gameRuntime.fireballs.releaseAll()
+        randomState = random.getstate()
+        game.enterStage(stageNumber)
+        random.setstate(randomState)
+    stage = game.stage
+
+    game.stageNumber = stageNumber
+    game.level = level
+    game.levelCounter = levelCounter
+    game.score = score
+    game.lives = lives
+    game.endGame = endGame
+    game.frames = frames
+
+    stage.level = level
+    stage.keepGoing = keepGoing
+    stage.endGame = stageEnd
+    stage.frames = stageFrames
+    stage.scoreKeeper.score = stageScore
+    stage.livesRemaining = livesRemaining
+    allSprites = stage.allSprites
+    for number, life in enumerate(stage.playerLives):
+        if number < livesRemaining:
+            allSprites.show(life)
+        else:
+            allSprites.hide(life)
+
+    # Load the player, sizing its rect to the frame it was showing
+    left, top, dx, dy, directionFacing, crouched, visible, state, index, ticks, cycles = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    player = stage.player
+    restoreAnimation(player, PLAYER_STATES, state, index, ticks, cycles)
+    player.rect = player.image.get_rect(topleft=(left, top))
+    player.dx = dx
+    player.dy = dy
+    player.directionFacing = directionFacing
+    player.crouched = crouched
+    if visible:
+        allSprites.show(player)
+    else:
+        allSprites.hide(player)
+
+    if stageNumber == 1:
+        stage.topFireballCounter, stage.bottomFireballCounter = STAGE_ONE.unpack_from(data, offset)
+        offset += STAGE_ONE.size
+    else:
+        portalOpen, visibleEndPortal, treasuresRemaining, fireballCooldown, dragonLeft, dragonDx, dragonFacing, shooting, state, index, ticks, cycles, treasureCount = STAGE_TWO.unpack_from(data, offset)
+        offset += STAGE_TWO.size
+        if stage.startPortal.open != portalOpen:
+            stage.startPortal.toggleImage()
+        if visibleEndPortal:
+            allSprites.add(stage.endPortal, layer=scene.BACKGROUND)
+        else:
+            allSprites.remove(stage.endPortal)
+        stage.visibleEndPortal = visibleEndPortal
+        stage.treasuresRemaining = treasuresRemaining
+        stage.fireballCooldown = fireballCooldown
+
+        # Load the dragon, whose rect keeps the size of its first frame
+        dragon = stage.dragon
+        restoreAnimation(dragon, DRAGON_STATES, state, index, ticks, cycles)
+        dragon.rect.left = dragonLeft
+        dragon.dx = dragonDx
+        dragon.directionFacing = dragonFacing
+        dragon.shooting = shooting
+
+        # Load the treasures, bucketing each one again where it was
+        treasureGroup = stage.treasureGroup
+        for treasure in stage.treasures[:treasureCount]:
+            value, left, top, alive = TREASURE.unpack_from(data, offset)
+            offset += TREASURE.size
+            treasure.kill()
+            treasure.reset(value, (left, top))
+            if alive:
+                allSprites.add(treasure, layer=scene.PICKUPS)
+                treasureGroup.add(treasure)
+
+    fireballCount, = FIREBALL_COUNT.unpack_from(data, offset)
+    offset += FIREBALL_COUNT.size
+    fireballStates = []
+    for number in range(fireballCount):
+        fireballStates.append(FIREBALL.unpack_from(data, offset))
+        offset += FIREBALL.size
+    gameRuntime.fireballs.setState(fireballStates)
+
+    if flags & WITH_RANDOM:
+        random.setstate(readRandomState(data, offset))
+        offset += RANDOM.size
+
+    # Nothing moved between ticks, and the whole screen has to be drawn again
+    allSprites.previous.clear()
+    gameRuntime.display.invalidate()
+    return offset
+
+
+class RewindBuffer:
+    '''This class defines a ring of the snapshots of the last few seconds of a game. Its memory is allocated once, as one slot big enough for the largest record for every tick it holds.'''
+    def __init__(self, seconds=DEFAULT_SECONDS, tickRate=gameLoop.TICK_RATE, fireballCap=runtime.FIREBALL_CAP):
+        '''This initializer takes how many seconds of ticks to keep, the ticks per second, and the most fireballs a snapshot can hold.'''
+        self.tickRate = tickRate
+        self.capacity = max(1, int(seconds * tickRate))
+        self.fireballCap = fireballCap
+        self.slotSize = recordSize(fireballCap, False)
+        self.buffer = bytearray(self.capacity * self.slotSize)
+        self.lengths = [0] * self.capacity
+        self.serials = [0] * self.capacity
+
+        # The random numbers are only drawn when a stage is built, so their state is kept once for every stage instead of in every snapshot
+        self.stage = None
+        self.serial = 0
+        self.randomStates = {}
+
+        # Instance variables
+        self.first = 0
+        self.count = 0
+
+        # Metrics
+        self.captures = 0
+        self.captureTime = 0
+        self.capturedBytes = 0
+        self.largestRecord = 0
+        self.rewinds = 0
+        self.restoreTime = 0
+
+    def capture(self, game):
+        '''This method adds a snapshot of the Game to the ring, overwriting the oldest one once the ring is full.'''
+        start = time.perf_counter_ns()
+        if game.stage is not self.stage:
+            self.stage = game.stage
+            self.serial += 1
+            self.randomStates[self.serial] = random.getstate()
+
+        if self.count == self.capacity:
+            slot = self.first
+            self.first = (self.first + 1) % self.capacity
+        else:
+            slot = (self.first + self.count) % self.capacity
+            self.count += 1
+        offset = slot * self.slotSize
+        length = writeRecord(game, self.buffer, offset, False, self.fireballCap) - offset
+        self.lengths[slot] = length
+        self.serials[slot] = self.serial
+
+        # Forget the random states of stages that have left the ring
+        oldest = self.serials[self.first]
+        if len(self.randomStates) > 1 and min(self.randomStates) < oldest:
+            for serial in [serial for serial in self.randomStates if serial < oldest]:
+                del self.randomStates[serial]
+
+        self.captures += 1
+        self.capturedBytes += length
+        self.largestRecord = max(self.largestRecord, length)
+        self.captureTime += time.perf_counter_ns() - start
+
+    def rewind(self, game, ticks):
+        '''This method puts the Game back the given number of ticks, or as far as the ring goes, and drops the snapshots after that point. It returns False if there was nothing to rewind to.'''
+        if self.count == 0:
+            return False
+        start = time.perf_counter_ns()
+        self.count -= min(ticks, self.count - 1)
+        slot = (self.first + self.count - 1) % self.capacity
+        offset = slot * self.slotSize
+        restore(game, memoryview(self.buffer)[offset:offset + self.lengths[slot]])
+
+        # Carry on from the stage of the snapshot, forgetting the stages after it
+        self.serial = self.serials[slot]
+        random.setstate(self.randomStates[self.serial])
+        for serial in [serial for serial in self.randomStates if serial > self.serial]:
+            del self.randomStates[serial]
+        self.stage = game.stage
+
+        self.rewinds += 1
+        self.restoreTime += time.perf_counter_ns() - start
+        return True
+
+    def handleEvents(self, game, events):
+        '''This method rewinds the Game for every press of the rewind key among the given events. It returns True if it rewound.'''
+        rewound = False
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == REWIND_KEY:
+                rewound = self.rewind(game, REWIND_SECONDS * self.tickRate) or rewound
+        return rewound
+
+    def getStats(self):
+        '''This method returns a dictionary of how many snapshots the ring holds, its memory, and what capturing and restoring cost.'''
+        return {
+            "snapshots": self.count,
+            "capacity": self.capacity,
+            "memoryBytes": len(self.buffer),
+            "captures": self.captures,
+            "averageBytes": self.capturedBytes / self.captures if self.captures else 0.0,
+            "largestBytes": self.largestRecord,
+            "averageCaptureMicroseconds": self.captureTime / self.captures / 1000 if self.captures else 0.0,
+            "rewinds": self.rewinds,
+            "averageRestoreMicroseconds": self.restoreTime / self.rewinds / 1000 if self.rewinds else 0.0
+        }
+
+    def printReport(self):
+        '''This method prints what the snapshots cost.'''
+        stats = self.getStats()
+        print("%d snapshots captured, %.1f bytes on average and %d at most, in %.1f us each" % (stats["captures"], stats["averageBytes"], stats["largestBytes"], stats["averageCaptureMicroseconds"]))
+        print("%d of %d slots in use, %d KB of memory" % (stats["snapshots"], stats["capacity"], stats["memoryBytes"] // 1024))
+        if stats["rewinds"]:
+            print("%d rewinds in %.1f us each" % (stats["rewinds"], stats["averageRestoreMicroseconds"]))
+
+
+if __name__ == "__main__":
+    import bots, headless
+    simulation = headless.Simulation(bots.playerBot, seed=0, projectiles=sys.argv[2] if len(sys.argv) > 2 else "pool")
+    game = simulation.game
+    rewindBuffer = RewindBuffer()
+
+    # Check that restoring every snapshot and capturing it again gives the same bytes
+    mismatches = 0
+    for frame in range(int(sys.argv[1]) if len(sys.argv) > 1 else 3000):
+        simulation.step()
+        rewindBuffer.capture(game)
+        if frame % 100 == 0:
+            record = capture(game)
+            restore(game, record)
+            if capture(game) != record:
+                mismatches += 1
+        if game.endGame:
+            break
+    rewindBuffer.printReport()
+    print("%d snapshots did not restore exactly" % mismatches)
+    sys.exit(1 if mismatches else 0)
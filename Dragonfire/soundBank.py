@@ -0,0 +1,89 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The sound bank module for the Dragonfire game. Each sound effect is decoded once and plays on its own reserved group of mixer channels, so a burst of one effect can never drown out the others.
+'''
+
+import pygame, assetCache
+
+
+class SoundBank:
+    '''This class defines a bank of sound effects that each have a fixed number of voices. When all of an effect's voices are busy, the voice that started playing first is stolen.'''
+    def __init__(self, effects):
+        '''This initializer takes a dictionary mapping each effect name to a (file name, voices) pair and reserves that many mixer channels for it.'''
+        # Give every effect its own block of reserved channels so Sound.play() elsewhere can not take them
+        totalVoices = sum(voices for fileName, voices in effects.values())
+        if pygame.mixer.get_num_channels() < totalVoices:
+            pygame.mixer.set_num_channels(totalVoices)
+        pygame.mixer.set_reserved(totalVoices)
+
+        self.fileNames = {}
+        self.sounds = {}
+        self.groups = {}
+        nextChannel = 0
+        for name, (fileName, voices) in effects.items():
+            self.fileNames[name] = fileName
+            self.groups[name] = [pygame.mixer.Channel(number) for number in range(nextChannel, nextChannel + voices)]
+            nextChannel += voices
+
+        # Order in which each channel last started playing, used to find the oldest voice
+        self.startOrder = dict((channel, 0) for group in self.groups.values() for channel in group)
+        self.playCount = 0
+
+        # Usage counters for the current frame and the whole session
+        self.framePlays = 0
+        self.frameSteals = 0
+        self.busyVoices = 0
+        self.totalPlays = 0
+        self.totalSteals = 0
+        self.peakBusyVoices = 0
+
+    def getSound(self, name):
+        '''This method returns the Sound for the given effect. The file is decoded once, at the mixer's sample rate, the first time it is needed.'''
+        sound = self.sounds.get(name)
+        if sound is None:
+            sound = assetCache.loadSound(self.fileNames[name])
+            self.sounds[name] = sound
+        return sound
+
+    def play(self, name):
+        '''This method plays the given effect on a free voice of its channel group, stealing the oldest voice if they are all busy.'''
+        group = self.groups[name]
+        voice = None
+        for channel in group:
+            if not channel.get_busy():
+                voice = channel
+                break
+        if voice is None:
+            voice = min(group, key=self.startOrder.get)
+            self.frameSteals += 1
+            self.totalSteals += 1
+
+        self.playCount += 1
+        self.startOrder[voice] = self.playCount
+        voice.play(self.getSound(name))
+        self.framePlays += 1
+        self.totalPlays += 1
+
+    def beginFrame(self):
+        '''This method should be called once at the start of every frame. It counts the voices still playing and resets the per-frame counters.'''
+        self.busyVoices = 0
+        for channel in self.startOrder:
+            if channel.get_busy():
+                self.busyVoices += 1
+        self.peakBusyVoices = max(self.peakBusyVoices, self.busyVoices)
+        self.framePlays = 0
+        self.frameSteals = 0
+
+    def getStats(self):
+        '''This method returns a dictionary of the mixer usage counters.'''
+        return {
+            "voices": len(self.startOrder),
+            "busyVoices": self.busyVoices,
+            "peakBusyVoices": self.peakBusyVoices,
+            "framePlays": self.framePlays,
+            "frameSteals": self.frameSteals,
+            "totalPlays": self.totalPlays,
+            "totalSteals": self.totalSteals
+        }
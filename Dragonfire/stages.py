@@ -0,0 +1,537 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The stages module for the Dragonfire game. Each stage is an object that runs one frame at a time when step() is called with that frame's input, so the caller decides how fast frames run and where input comes from. A Game alternates between the two stages.
+'''
+
+import pygame, random, time, mySprites, assetCache, atlas, staticLayer, scene, collision, placement
+
+
+# Treasures spread over the second stage
+TREASURES = 10
+
+
+class Stage:
+    '''This class defines the stage engine both stages run on: the HUD, losing a life, and updating and drawing the sprites. A stage is defined by its number, background, and portal locations, and by hooks: createSprites() and resetSprites() build and reset its own sprites, and handleEvent() and simulate() play it. Its sprites are built once and reset by enter() every time the game comes back to it, so a transition builds and loads nothing.'''
+    # Stage definition: the number of the stage, its background image, and the locations of its start and end portals
+    NUMBER = None
+    BACKGROUND = None
+    START_PORTAL = None
+    END_PORTAL = None
+
+    def __init__(self, runtime, highScore, lives):
+        '''This initializer takes the Runtime, the highscore to show, and the most lives the stage will be entered with, and builds the stage's sprites. The stage is played from its start once enter() has been called.'''
+        self.runtime = runtime
+        self.level = 0
+        self.keepGoing = True
+        self.endGame = False
+        self.frames = 0
+
+        # E - Entities
+        background = assetCache.loadImage(self.BACKGROUND)
+
+        # Sprites
+        self.startPortal = mySprites.Portal(self.NUMBER, self.START_PORTAL)
+
+        self.endPortal = mySprites.Portal(self.NUMBER, self.END_PORTAL)
+
+        self.player = mySprites.Player(runtime.screen, self.NUMBER, self.spawnLocation())
+
+        self.createHud(0, highScore, lives)
+
+        # Sprite groups
+        self.allSprites = scene.Scene()
+        self.createSprites()
+        self.attachScene(background)
+
+        # Build the collision mask of every frame now, so no tick has to build one the first time it collides
+        collision.precomputeMasks(self.collisionImages())
+
+    def collisionImages(self):
+        '''This method returns the images that can take part in a collision: every frame of the player and the fireballs. Stages with more to collide with add theirs.'''
+        return list(atlas.loadFrames("player").values()) + list(atlas.loadFrames("fireball").values())
+
+    def spawnLocation(self):
+        '''This method returns where the player is spawned at the start of the stage, beside the start portal.'''
+        return (self.startPortal.rect.left, self.startPortal.rect.bottom)
+
+    def createSprites(self):
+        '''This method builds the stage's own sprites and adds them, the portals, and the player to the Scene. It is filled in by every stage.'''
+
+    def resetSprites(self):
+        '''This method puts the stage's own sprites and counters back the way the stage starts. It is filled in by every stage.'''
+
+    def enter(self, score, lives, level):
+        '''This method starts the stage from the beginning with the given score, lives, and level of difficulty, resetting its sprites instead of building new ones.'''
+        self.level = level
+        self.keepGoing = True
+        self.endGame = False
+        self.frames = 0
+
+        # Show one life icon for every life remaining
+        allSprites = self.allSprites
+        self.scoreKeeper.score = score
+        self.livesRemaining = lives
+        for number, life in enumerate(self.playerLives):
+            if number < lives:
+                allSprites.show(life)
+            else:
+                allSprites.hide(life)
+
+        self.player.spawn(self.spawnLocation())
+        allSprites.show(self.player)
+        self.resetSprites()
+
+        # Nothing moved since the last time the stage was shown, and the other stage is still on the screen
+        allSprites.previous.clear()
+        self.runtime.fireballs.attach(allSprites)
+        self.hudLayer.invalidate()
+
+    def createHud(self, score, highScore, lives):
+        '''This method creates the score keepers and the life icons shown at the bottom of the screen.'''
+        self.scoreKeeper = mySprites.ScoreKeeper(False, score)
+
+        self.highScoreKeeper = mySprites.ScoreKeeper(True, highScore)
+
+        self.playerLives = []
+        for number in range(1, lives + 1):
+            life = mySprites.Life(number)
+            self.playerLives.append(life)
+        self.livesRemaining = lives
+
+    def attachScene(self, background):
+        '''This method adds the HUD to the stage's Scene and caches it over the background.'''
+        self.allSprites.add(self.scoreKeeper, self.highScoreKeeper, self.playerLives, layer=scene.HUD)
+        self.allSprites.interpolate = self.runtime.interpolate
+        self.hudLayer = staticLayer.StaticLayer(self.runtime.screen, background, self.allSprites)
+
+    def handleEvent(self, event, keysPressed):
+        '''This method responds to one input event. It is filled in by each stage.'''
+
+    def handleEvents(self, events, keysPressed):
+        '''This method ends the game if the window was closed and passes every event to handleEvent().'''
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.endGame = True
+                self.keepGoing = False
+            self.handleEvent(event, keysPressed)
+
+    def spawnFireballs(self):
+        '''This method shoots new fireballs when they are due. It is filled in by each stage.'''
+
+    def checkCollisions(self):
+        '''This method handles the player touching fireballs and pickups. It is filled in by each stage.'''
+
+    def checkPortals(self):
+        '''This method hides the player in the spawn portal and ends the stage at the end portal. It is filled in by each stage.'''
+
+    def simulate(self):
+        '''This method runs the stage's game logic for one tick.'''
+        self.spawnFireballs()
+        self.checkCollisions()
+        self.checkPortals()
+
+    def updateSprites(self):
+        '''This method moves and animates the sprites and fireballs.'''
+        self.allSprites.update()
+        self.runtime.fireballs.update()
+
+    def refreshHud(self):
+        '''This method redraws the background and HUD if the score or lives changed, in which case the whole screen is presented.'''
+        if self.hudLayer.refresh(self.scoreKeeper.score):
+            self.runtime.display.invalidate()
+
+    def clearSprites(self):
+        '''This method erases the moving sprites, fireballs, and overlay where they were last drawn.'''
+        self.allSprites.clear(self.runtime.screen, self.hudLayer.surface)
+        self.runtime.fireballs.clear(self.runtime.screen, self.hudLayer.surface)
+        if self.runtime.overlay is not None:
+            self.runtime.overlay.clear(self.runtime.screen, self.hudLayer.surface)
+
+    def drawSprites(self, alpha=1.0):
+        '''This method draws the moving sprites and fireballs, then the overlay over them, and records the areas that changed. An alpha below 1 draws them that far between their last two positions.'''
+        screen = self.runtime.screen
+        display = self.runtime.display
+        display.addRects(self.allSprites.draw(screen, alpha))
+        display.addRects(self.runtime.fireballs.draw(screen, alpha))
+        if self.runtime.overlay is not None:
+            display.addRects(self.runtime.overlay.draw(screen, self, self.runtime.sounds))
+
+    def drawFrame(self, alpha=1.0):
+        '''This method erases and redraws the moving sprites and fireballs.'''
+        self.clearSprites()
+        self.drawSprites(alpha)
+
+    def loseLife(self, spawnLocation):
+        '''This method sends the player back to the given spawn location after being hit and takes away a life. Hits after the last life are ignored.'''
+        if self.livesRemaining == 0:
+            return
+        self.player.reset(spawnLocation)
+        self.livesRemaining -= 1
+        self.allSprites.hide(self.playerLives[self.livesRemaining])
+        self.updateSprites()
+        self.runtime.sounds.play("death")
+
+    def tick(self, events, keysPressed):
+        '''This method runs one tick of the stage's game logic with the given events and held keys.'''
+        # E - Event handling
+        self.handleEvents(events, keysPressed)
+
+        self.simulate()
+        self.updateSprites()
+        self.frames += 1
+
+    def render(self, alpha=1.0):
+        '''This method draws and presents the current frame, unless the Runtime does not render.'''
+        # R - Refresh display
+        if self.runtime.render:
+            self.refreshHud()
+            self.drawFrame(alpha)
+            self.runtime.display.present()
+
+    def step(self, events, keysPressed):
+        '''This method runs one tick of the stage and renders it.'''
+        self.tick(events, keysPressed)
+        self.render()
+
+    def result(self):
+        '''This method returns whether the game is over, the score, and the lives remaining.'''
+        return self.endGame, self.scoreKeeper.score, self.livesRemaining
+
+
+class StageOne(Stage):
+    '''This class defines the first stage in the Dragonfire game.'''
+    NUMBER = 1
+    BACKGROUND = "myImages/backgroundStage1.jpg"
+    START_PORTAL = (599, 312)
+    END_PORTAL = (28, 312)
+
+    def createSprites(self):
+        '''This method adds the portals and the player to the Scene.'''
+        self.allSprites.add(self.startPortal, self.endPortal, layer=scene.BACKGROUND)
+        self.allSprites.add(self.player, layer=scene.ACTORS)
+
+    def resetSprites(self):
+        '''This method restarts the fireball counters.'''
+        # A - Assign values
+        self.topFireballCounter = 30
+        self.bottomFireballCounter = 80
+
+    def handleEvent(self, event, keysPressed):
+        '''This method lets the player walk, jump, and crouch.'''
+        player = self.player
+        level = self.level
+        # Movement
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_a or event.key == pygame.K_LEFT:
+                if not self.allSprites.isVisible(player):
+                    self.allSprites.show(player)
+                    player.reset((self.startPortal.rect.left, self.startPortal.rect.bottom))
+                player.changeDirection((-8 - level, 0), 1)
+            if event.key == pygame.K_d or event.key == pygame.K_RIGHT:
+                player.changeDirection((8 + level, 0), 1)
+            if event.key == pygame.K_w or event.key == pygame.K_UP or event.key == pygame.K_SPACE:
+                player.jump()
+            if event.key == pygame.K_s or event.key == pygame.K_DOWN:
+                player.toggleCrouch()
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_s or event.key == pygame.K_DOWN:
+                player.toggleCrouch()
+                if keysPressed[pygame.K_a] or keysPressed[pygame.K_LEFT]:
+                    player.changeDirection((-8 - level, 0), 1)
+                if keysPressed[pygame.K_d] or keysPressed[pygame.K_RIGHT]:
+                    player.changeDirection((8 + level, 0), 1)
+            if event.key == pygame.K_a or event.key == pygame.K_LEFT:
+                if player.directionFacing == 1:
+                    player.changeDirection((0, 0), 1)
+            if event.key == pygame.K_d or event.key == pygame.K_RIGHT:
+                if player.directionFacing == 0:
+                    player.changeDirection((0, 0), 1)
+
+    def spawnFireballs(self):
+        '''This method shoots fireballs across the drawbridge at head and foot height.'''
+        fireballs = self.runtime.fireballs
+        sounds = self.runtime.sounds
+        level = self.level
+
+        # Spawn top fireball
+        if self.topFireballCounter >= 60 - level:
+            topFireball = fireballs.spawn(1, ((self.endPortal.rect.right, 280), (550, 280)), level)
+            if topFireball:
+                sounds.play("fireball")
+            self.topFireballCounter = 0
+        else:
+            self.topFireballCounter += 1
+
+        # Spawn bottom fireball
+        if self.bottomFireballCounter >= 110 - level:
+            bottomFireball = fireballs.spawn(1, ((self.endPortal.rect.right, 305), (550, 305)), level)
+            if bottomFireball:
+                sounds.play("fireball")
+            self.bottomFireballCounter = 0
+        else:
+            self.bottomFireballCounter += 1
+
+    def checkCollisions(self):
+        '''This method takes a life for every fireball that hit the player.'''
+        # Check if the player has been killed by a fireball
+        for hit in range(self.runtime.fireballs.collide(self.player)):
+            self.loseLife((self.startPortal.rect.left, self.startPortal.rect.bottom))
+
+        # Check if player has died
+        if self.livesRemaining == 0:
+            self.endGame = True
+            self.keepGoing = False
+
+    def checkPortals(self):
+        '''This method hides the player in the spawn portal and sends them to the second stage at the end portal.'''
+        # Hide the player if they touch the spawn portal
+        if self.allSprites.isVisible(self.player):
+            if self.player.rect.right >= self.startPortal.rect.left:
+                self.allSprites.hide(self.player)
+                self.player.rect.top = 0
+
+        # Transport the player to second stage if the player touches the end portal
+        if self.player.rect.left <= self.endPortal.rect.right:
+            self.keepGoing = False
+
+
+class StageTwo(Stage):
+    '''This class defines the second stage in the Dragonfire game.'''
+    NUMBER = 2
+    BACKGROUND = "myImages/backgroundStage2.PNG"
+    START_PORTAL = (560, 270)
+    END_PORTAL = (40, 80)
+
+    def createSprites(self):
+        '''This method builds the Dragon and the treasures and adds the start portal, the Dragon, and the player to the Scene. The treasures are added when the stage is entered, and the end portal once every treasure has been collected.'''
+        self.dragon = mySprites.Dragon(self.runtime.screen, 0)
+
+        # The treasures get their values and places every time the stage is entered
+        self.treasures = [mySprites.Treasure(10) for i in range(TREASURES)]
+        self.treasureGroup = collision.SpatialHash()
+
+        self.allSprites.add(self.startPortal, layer=scene.BACKGROUND)
+        self.allSprites.add(self.dragon, self.player, layer=scene.ACTORS)
+
+    def collisionImages(self):
+        '''This method returns the frames of the player and the fireballs, and the image of every treasure value.'''
+        return Stage.collisionImages(self) + [assetCache.loadImage("myImages/treasure%d.PNG" % (value / 10)) for value in range(10, 60, 10)]
+
+    def resetSprites(self):
+        '''This method rolls new treasures and spreads them over the stage, and puts the Dragon and the portals back the way the stage starts.'''
+        allSprites = self.allSprites
+        for treasure in self.treasures:
+            treasure.kill()
+            treasure.reset(random.randrange(10, 60, 10))
+        placement.placeSprites(self.treasures, placement.TREASURE_AREA)
+        allSprites.add(self.treasures, layer=scene.PICKUPS)
+        self.treasureGroup.add(self.treasures)
+
+        self.dragon.reset(self.level)
+        if not self.startPortal.open:
+            self.startPortal.toggleImage()
+        allSprites.remove(self.endPortal)
+
+        # A - Assign values
+        self.visibleEndPortal = False
+        self.treasuresRemaining = len(self.treasures)
+        self.fireballCooldown = 0
+
+    def handleEvent(self, event, keysPressed):
+        '''This method lets the player move in all four directions.'''
+        player = self.player
+        level = self.level
+        # Movement
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_a or event.key == pygame.K_LEFT:
+                if not self.allSprites.isVisible(player):
+                    self.allSprites.show(player)
+                    player.reset((self.startPortal.rect.left, self.startPortal.rect.bottom))
+                    self.startPortal.toggleImage()
+                player.changeDirection((-8 - level, 0), 1)
+            if event.key == pygame.K_d or event.key == pygame.K_RIGHT:
+                player.changeDirection((8 + level, 0), 1)
+            if event.key == pygame.K_w or event.key == pygame.K_UP:
+                player.changeDirection((0, 8 + level), 0)
+            if event.key == pygame.K_s or event.key == pygame.K_DOWN:
+                player.changeDirection((0, -8 - level), 0)
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_a or event.key == pygame.K_LEFT:
+                if keysPressed[pygame.K_d] or keysPressed[pygame.K_RIGHT]:
+                    player.changeDirection((8 + level, 0), 1)
+                else:
+                    player.changeDirection((0, 0), 1)
+            if event.key == pygame.K_d or event.key == pygame.K_RIGHT:
+                if keysPressed[pygame.K_a] or keysPressed[pygame.K_LEFT]:
+                    player.changeDirection((-8 - level, 0), 1)
+                else:
+                    player.changeDirection((0, 0), 1)
+            if event.key == pygame.K_w or event.key == pygame.K_UP:
+                player.changeDirection((0, 0), 0)
+            if event.key == pygame.K_s or event.key == pygame.K_DOWN:
+                player.changeDirection((0, 0), 0)
+
+    def spawnFireballs(self):
+        '''This method has the Dragon shoot upwards when the player is above it.'''
+        fireballs = self.runtime.fireballs
+        player = self.player
+        dragon = self.dragon
+        level = self.level
+
+        # Make the Dragon shoot fireballs if it is close to the Player
+        if player.rect.center[0] > dragon.rect.left and player.rect.center[0] < dragon.rect.right:
+            if self.fireballCooldown == 0:
+                if dragon.directionFacing == 0:
+                    fireball = fireballs.spawn(2, ((dragon.rect.center[0] + 30, 380), (dragon.rect.center[0] + 30, 30)), level)
+                else:
+                    fireball = fireballs.spawn(2, ((dragon.rect.center[0] - 70, 380), (dragon.rect.center[0] - 70, 30)), level)
+                if fireball:
+                    dragon.setShooting()
+                    self.runtime.sounds.play("fireball")
+                self.fireballCooldown = 10
+
+        # Reduce frequency of fireballs being shot
+        if self.fireballCooldown > 0:
+            self.fireballCooldown -= 1
+
+    def checkCollisions(self):
+        '''This method takes a life for every fireball that hit the player and collects the treasures they touch.'''
+        player = self.player
+
+        # Check if the player has been killed by a fireball
+        for hit in range(self.runtime.fireballs.collide(player)):
+            self.loseLife((self.startPortal.rect.right, self.startPortal.rect.bottom))
+
+        # Check if player has died
+        if self.livesRemaining == 0:
+            self.endGame = True
+            self.keepGoing = False
+
+        # Check if the Player has colllected a treasure
+        treasureCollisions = self.treasureGroup.collide(player, False)
+        for treasure in treasureCollisions:
+            self.scoreKeeper.addScore(treasure.value)
+            treasure.kill()
+            treasure.move()
+            self.treasuresRemaining -= 1
+            self.runtime.sounds.play("treasure")
+        self.treasureGroup.refresh()
+
+    def checkPortals(self):
+        '''This method hides the player in the spawn portal, shows the end portal once every treasure is collected, and sends the player to the first stage through it.'''
+        player = self.player
+
+        # Hide the player if they touch the spawn portal
+        if self.allSprites.isVisible(player):
+            if player.rect.colliderect(self.startPortal.rect):
+                player.rect.left = 700
+                self.allSprites.hide(player)
+                self.startPortal.toggleImage()
+
+        # Show the end Portal once all of the treasures have been collected
+        if self.treasuresRemaining == 0 and not self.visibleEndPortal:
+            self.allSprites.add(self.endPortal, layer=scene.BACKGROUND)
+            self.visibleEndPortal = True
+
+        # Transport the player to first stage if the player touches the end portal
+        if self.visibleEndPortal == True:
+            if player.rect.colliderect(self.endPortal.rect):
+                self.keepGoing = False
+
+
+class Game:
+    '''This class defines a game of Dragonfire, which alternates between the two stages and raises the level every fourth time the first stage starts, until the player runs out of lives or quits.'''
+    def __init__(self, runtime, highScore, lives=7, level=0):
+        '''This initializer takes the Runtime, the highscore to show, the number of lives to start with, and the level of difficulty to start at, and starts the first stage.'''
+        self.runtime = runtime
+        self.highScore = highScore
+        self.score = 0
+        self.lives = lives
+        self.level = level
+        self.levelCounter = 0
+        self.endGame = False
+        self.stageNumber = 2
+        self.frames = 0
+
+        # Both stages are built once, up front, and entered again at every transition
+        self.stages = {1: StageOne(runtime, highScore, lives), 2: StageTwo(runtime, highScore, lives)}
+
+        # Metrics
+        self.transitions = 0
+        self.transitionTime = 0.0
+        self.slowestTransition = 0.0
+
+        self.nextStage()
+
+    def nextStage(self):
+        '''This method starts the stage after the current one and records how long the transition took.'''
+        start = time.perf_counter()
+
+        # Return live fireballs to the pool
+        self.runtime.fireballs.releaseAll()
+
+        if self.stageNumber == 2:
+            # Occasionally increase difficulty
+            if self.levelCounter == 3:
+                self.level += 1
+                self.levelCounter = 0
+            else: self.levelCounter += 1
+
+            self.enterStage(1)
+        else:
+            self.enterStage(2)
+
+        elapsed = time.perf_counter() - start
+        self.transitions += 1
+        self.transitionTime += elapsed
+        self.slowestTransition = max(self.slowestTransition, elapsed)
+
+    def enterStage(self, stageNumber):
+        '''This method makes the given stage the current one and starts it with the game's score, lives, and level.'''
+        self.stageNumber = stageNumber
+        self.stage = self.stages[stageNumber]
+        self.stage.enter(self.score, self.lives, self.level)
+
+    def getStats(self):
+        '''This method returns a dictionary of how many stage transitions there were and how long they took.'''
+        return {
+            "transitions": self.transitions,
+            "averageTransitionMs": self.transitionTime * 1000 / self.transitions if self.transitions else 0.0,
+            "slowestTransitionMs": self.slowestTransition * 1000
+        }
+
+    def tick(self):
+        '''This method runs one tick of the current stage with input from the Runtime's input source. The next stage starts on the tick after the current one ends, so the last frame of a stage can still be rendered.'''
+        if not self.stage.keepGoing:
+            self.nextStage()
+
+        self.runtime.sounds.beginFrame()
+        events, keysPressed = self.runtime.input.poll(self)
+
+        # The overlay is toggled outside the stage, so it never changes the game logic
+        if self.runtime.overlay is not None:
+            self.runtime.overlay.handleEvents(events)
+
+        # Go back in time instead of running the tick if a rewind was asked for
+        if self.runtime.rewind is not None and self.runtime.rewind.handleEvents(self, events):
+            return
+        self.stage.tick(events, keysPressed)
+        self.frames += 1
+
+        if not self.stage.keepGoing:
+            self.endGame, self.score, self.lives = self.stage.result()
+
+        # Keep a snapshot of the tick for rewinding
+        if self.runtime.rewind is not None:
+            self.runtime.rewind.capture(self)
+
+    def render(self, alpha=1.0):
+        '''This method renders the current stage.'''
+        self.stage.render(alpha)
+
+    def step(self):
+        '''This method runs one tick and renders it.'''
+        self.tick()
+        self.render()
@@ -0,0 +1,41 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The static layer module for the Dragonfire game. The background and the HUD layer of the scene are composited into one cached Surface that is only rebuilt when the score changes or a HUD sprite is shown or hidden, so the per-frame clear and draw only have to deal with the moving sprites.
+'''
+
+import scene
+
+
+class StaticLayer:
+    '''This class defines the cached background and HUD layer of a stage.'''
+    def __init__(self, screen, background, stageScene):
+        '''This initializer takes the screen surface, the background image, and the Scene whose HUD layer is drawn on top of it.'''
+        self.screen = screen
+        self.background = background
+        self.scene = stageScene
+        self.surface = background.copy()
+
+        # Instance variables
+        self.key = None
+        self.rebuilds = 0
+
+    def invalidate(self):
+        '''This method makes the next refresh() rebuild the layer and redraw the whole screen, e.g. when the stage is entered again.'''
+        self.key = None
+
+    def refresh(self, score):
+        '''This method rebuilds the layer and redraws it on the screen if the score or the HUD sprites have changed since the last rebuild. It returns True if the whole screen was redrawn.'''
+        key = (score, self.scene.staticVersion)
+        if self.key == key:
+            return False
+        self.key = key
+
+        # Composite the HUD onto a fresh copy of the background
+        self.scene.updateLayer(scene.HUD)
+        self.surface.blit(self.background, (0, 0))
+        self.scene.drawLayer(self.surface, scene.HUD)
+        self.screen.blit(self.surface, (0, 0))
+        self.rebuilds += 1
+        return True
@@ -0,0 +1,132 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The sweep module for the Dragonfire game. A sweep plays one headless game for every pair of starting level and seed in a grid, spread over a pool of processes on every core, with a bot or a scripted policy at the keys. The games are summed up by level in one table of survival time, deaths in each stage, and score, along with how many simulated frames per second the sweep reached. This is meant for tuning the difficulty without playing the game by hand.
+'''
+
+import argparse, gc, json, multiprocessing, os, time, bots, gameLoop, headless, inputSource
+
+# Frames a game may last before it is stopped, ten minutes of game time
+DEFAULT_FRAMES = gameLoop.TICK_RATE * 600
+
+# Policies a sweep can play with, by name. Each one takes the seed of the game and returns the policy.
+POLICIES = {
+    "player": lambda seed: bots.playerBot,
+    "idle": lambda seed: bots.idleBot,
+    "random": lambda seed: inputSource.randomPolicy(seed)
+}
+
+
+def parseValues(text):
+    '''This function turns a list of numbers and ranges such as "0-4,10" into a list of integers.'''
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            values.extend(range(int(first), int(last) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def playGame(task):
+    '''This function plays one headless game for a (policy name, level, seed, frame limit) task and returns a dictionary of how it went.'''
+    policyName, level, seed, frames = task
+    # Free the sprites of the worker's last game, which hold references to each other
+    gc.collect()
+    start = time.perf_counter()
+    simulation = headless.Simulation(POLICIES[policyName](seed), seed=seed, level=level)
+    game = simulation.game
+
+    # Count the lives lost in each stage by watching the lives remaining after every frame. A new stage starts with the lives the last one ended with.
+    deaths = {1: 0, 2: 0}
+    while game.frames < frames and not game.endGame:
+        lives = game.stage.livesRemaining
+        game.step()
+        deaths[game.stageNumber] += lives - game.stage.livesRemaining
+
+    return {
+        "policy": policyName,
+        "level": level,
+        "seed": seed,
+        "frames": game.frames,
+        "survivalSeconds": game.frames / gameLoop.TICK_RATE,
+        "gameOver": game.endGame,
+        "stageOneDeaths": deaths[1],
+        "stageTwoDeaths": deaths[2],
+        "score": game.stage.scoreKeeper.score,
+        "finalLevel": game.level,
+        "seconds": time.perf_counter() - start
+    }
+
+
+def runSweep(policyName, levels, seeds, frames=DEFAULT_FRAMES, processes=None):
+    '''This function plays a game for every level and seed across a pool of processes, one per core by default. It returns the results of every game, sorted by level and seed, and the seconds the sweep took.'''
+    tasks = [(policyName, level, seed, frames) for level in levels for seed in seeds]
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    pool = context.Pool(processes or os.cpu_count())
+    results = list(pool.imap_unordered(playGame, tasks))
+    pool.close()
+    pool.join()
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda result: (result["level"], result["seed"]))
+    return results, elapsed
+
+
+def summarize(results):
+    '''This function sums up the games of each starting level and returns a list of rows: level, games, games over, mean survival seconds, mean deaths in each stage, mean score, and best score.'''
+    levels = {}
+    for result in results:
+        levels.setdefault(result["level"], []).append(result)
+
+    rows = []
+    for level in sorted(levels):
+        games = levels[level]
+        count = len(games)
+        rows.append((
+            level,
+            count,
+            sum(1 for game in games if game["gameOver"]),
+            sum(game["survivalSeconds"] for game in games) / count,
+            sum(game["stageOneDeaths"] for game in games) / count,
+            sum(game["stageTwoDeaths"] for game in games) / count,
+            sum(game["score"] for game in games) / count,
+            max(game["score"] for game in games)
+        ))
+    return rows
+
+
+def printTable(results, elapsed):
+    '''This function prints the summary of a sweep by level and the frames per second it reached.'''
+    print("%5s %6s %6s %10s %10s %10s %10s %8s" % ("level", "games", "over", "survived s", "deaths 1", "deaths 2", "score", "best"))
+    for row in summarize(results):
+        print("%5d %6d %6d %10.1f %10.2f %10.2f %10.1f %8d" % row)
+
+    frames = sum(result["frames"] for result in results)
+    busy = sum(result["seconds"] for result in results)
+    print("%d frames in %.2f s: %.0f simulated frames per second, %.0f per process" % (frames, elapsed, frames / elapsed if elapsed else 0.0, frames / busy if busy else 0.0))
+
+
+def main():
+    '''This function runs a sweep from the command line.'''
+    parser = argparse.ArgumentParser(description="Play headless Dragonfire games over a grid of levels and seeds.")
+    parser.add_argument("--levels", default="0-10", help="starting levels, such as 0-10 or 0,5,10")
+    parser.add_argument("--seeds", default="0-7", help="seeds, such as 0-7 or 1,2,3")
+    parser.add_argument("--policy", default="player", choices=sorted(POLICIES), help="bot or scripted policy at the keys")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames a game may last before it is stopped")
+    parser.add_argument("--processes", type=int, help="processes in the pool (default: one per core)")
+    parser.add_argument("--output", help="file to write the result of every game to as JSON")
+    arguments = parser.parse_args()
+
+    results, elapsed = runSweep(arguments.policy, parseValues(arguments.levels), parseValues(arguments.seeds), arguments.frames, arguments.processes)
+    printTable(results, elapsed)
+    if arguments.output:
+        outputFile = open(arguments.output, "w")
+        json.dump({"policy": arguments.policy, "frames": arguments.frames, "seconds": elapsed, "games": results}, outputFile, indent=2)
+        outputFile.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+''' Author: Gavin Tse
+
+    Date: October 18, 2026
+
+    Description: The vector environment module for the Dragonfire game. A VectorEnv runs many games at once in one process for training automated players. Each game's state lives in one row of NumPy arrays, not in a graph of sprites. A step takes the actions of every game and returns their observations, rewards, and done flags as arrays. The rules, animation frames, and mask collisions follow the stages and sprites, so a game plays out the same as it would in the window, except that the treasures are spread with the environment's own random numbers. Running this module prints how many game steps per second the environment reaches.
+'''
+
+import pygame, sys, time, atlas, collision, gameLoop, mySprites, placement, projectileArray, runtime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# An action is the set of keys held, as bits, so there are 16 of them
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+ACTION_COUNT = 16
+
+# Frames a game may last before it is stopped and started again, ten minutes of game time
+DEFAULT_FRAMES = gameLoop.TICK_RATE * 600
+
+# Reward taken away for every life lost, next to the score gained
+LIFE_PENALTY = 50
+
+# Nearest fireballs included in an observation
+OBSERVED_FIREBALLS = 4
+
+# Treasures in the second stage
+TREASURES = 10
+
+# Width of the screen and the limits of the player's movement, matching Player.update()
+SCREEN_WIDTH = 640
+CEILING = 31
+FLOOR = 370
+GROUND = 312
+
+# Portals as (left, bottom), matching the stages. The portals of the first stage are blank Surfaces STAGE_ONE_PORTAL_WIDTH wide.
+STAGE_ONE_PORTAL_WIDTH = 20
+STAGE_ONE_START_PORTAL = (599, 312)
+STAGE_ONE_END_PORTAL = (28, 312)
+STAGE_TWO_START_PORTAL = (560, 270)
+STAGE_TWO_END_PORTAL = (40, 80)
+
+# Fireball kinds, matching ProjectileArray
+SIDE = projectileArray.SIDE
+UP_KIND = projectileArray.UP
+
+# Player animations, numbered as kind * 2 + side, where the side is 0 facing left and 1 facing right
+STAND = 0
+RUN = 1
+CROUCH = 2
+PLAYER_STATES = ("standLeft", "standRight", "runLeft", "runRight", "crouchLeft", "crouchRight")
+
+# Values in every observation, followed by (x, y, present) of the nearest fireballs and (x, y, value) of every treasure, relative to the player
+OBSERVATION_FIELDS = (
+    "stage", "level", "lives", "playerX", "playerY", "playerDx", "playerDy", "facing", "crouched", "visible",
+    "topFireballCounter", "bottomFireballCounter", "dragonX", "dragonDx", "fireballCooldown", "treasuresRemaining", "endPortalVisible"
+)
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS) + 3 * OBSERVED_FIREBALLS + 3 * TREASURES
+
+
+def loadFrames(character):
+    '''This function returns a dictionary of the frames of a character keyed by frame name, cut from its sheet if the atlas has been built. The images are not converted, so no display is needed.'''
+    entry = atlas.readIndex().get(character)
+    if entry is not None:
+        sheet = pygame.image.load(entry["sheet"])
+        return dict((frameName, sheet.subsurface(pygame.Rect(frameRect))) for frameName, frameRect in entry["frames"].items())
+    return dict((frameName, pygame.image.load(atlas.findFrameFile(frameName))) for frameName in atlas.CHARACTERS[character])
+
+
+class VectorEnv:
+    '''This class defines a number of independent Dragonfire games stepped together, with their state in NumPy arrays. A game that ends is started again at once, so every step returns a full batch.'''
+    def __init__(self, count, seed=None, lives=7, level=0, maxFrames=DEFAULT_FRAMES, lifePenalty=LIFE_PENALTY, fireballCap=runtime.FIREBALL_CAP):
+        '''This initializer takes the number of games, the seed for their random numbers, the lives and level every game starts with, the frames a game may last, the reward taken away for each life lost, and the most fireballs one game can have.'''
+        if numpy is None:
+            raise ImportError("VectorEnv requires numpy")
+        self.count = count
+        self.startLives = lives
+        self.startLevel = level
+        self.maxFrames = maxFrames
+        self.lifePenalty = lifePenalty
+        self.rng = numpy.random.default_rng(seed)
+
+        # Player frames, and the frames and ticks of every animation state as tables padded to the longest one
+        frames = loadFrames("player")
+        tables = [mySprites.PLAYER_ANIMATIONS[state] for state in PLAYER_STATES]
+        frameNames = sorted(set(frameName for table in tables for frameName, ticks in table))
+        length = max(len(table) for table in tables)
+        self.playerImages = [frames[frameName] for frameName in frameNames]
+        self.playerSizes = numpy.array([image.get_size() for image in self.playerImages])
+        self.stateFrames = numpy.array([[frameNames.index(table[index % len(table)][0]) for index in range(length)] for table in tables])
+        self.stateTicks = numpy.array([[table[index % len(table)][1] for index in range(length)] for table in tables])
+        self.stateLengths = numpy.array([len(table) for table in tables])
+
+        # Fireball frames by kind * 2 + frame, the same as a ProjectileArray. A fireball keeps the size of its first frame.
+        frames = loadFrames("fireball")
+        self.fireballImages = [frames["sideFireball1"], frames["sideFireball2"], frames["upFireball1"], frames["upFireball2"]]
+        self.fireballSizes = numpy.array([frames["sideFireball1"].get_size(), frames["upFireball1"].get_size()], dtype=numpy.float64)
+
+        # The Dragon keeps the size of its first frame as well
+        self.dragonWidth = loadFrames("dragon")["dragonRight1"].get_width()
+
+        # Treasure images by value / 10, with nothing at 0
+        self.portalSize = pygame.image.load("myImages/openPortal.PNG").get_size()
+        self.treasureImages = [None] + [pygame.image.load("myImages/treasure%d.PNG" % number) for number in range(1, 6)]
+        self.treasureSizes = numpy.array([(0, 0)] + [image.get_size() for image in self.treasureImages[1:]])
+
+        # Occupancy grid the treasures are placed on, with cells as big as the largest treasure
+        self.treasureGrid = placement.gridSize(self.treasureSizes[1:].tolist(), placement.TREASURE_AREA)
+
+        # Game state
+        self.stage = numpy.zeros(count, dtype=numpy.int64)
+        self.level = numpy.zeros(count, dtype=numpy.int64)
+        self.levelCounter = numpy.zeros(count, dtype=numpy.int64)
+        self.lives = numpy.zeros(count, dtype=numpy.int64)
+        self.score = numpy.zeros(count, dtype=numpy.int64)
+        self.frames = numpy.zeros(count, dtype=numpy.int64)
+        self.held = numpy.zeros(count, dtype=numpy.int64)
+
+        # Player state, with the rect as left, top, width, and height
+        self.x = numpy.zeros(count, dtype=numpy.int64)
+        self.y = numpy.zeros(count, dtype=numpy.int64)
+        self.w = numpy.zeros(count, dtype=numpy.int64)
+        self.h = numpy.zeros(count, dtype=numpy.int64)
+        self.dx = numpy.zeros(count, dtype=numpy.int64)
+        self.dy = numpy.zeros(count, dtype=numpy.int64)
+        self.facing = numpy.zeros(count, dtype=numpy.int64)
+        self.crouched = numpy.zeros(count, dtype=bool)
+        self.visible = numpy.zeros(count, dtype=bool)
+
+        # Player animation: the state, the position in its table, the ticks the frame has been shown, and the frame showing
+        self.animationState = numpy.zeros(count, dtype=numpy.int64)
+        self.animationIndex = numpy.zeros(count, dtype=numpy.int64)
+        self.animationTicks = numpy.zeros(count, dtype=numpy.int64)
+        self.playerFrame = numpy.zeros(count, dtype=numpy.int64)
+
+        # Stage one state
+        self.topFireballCounter = numpy.zeros(count, dtype=numpy.int64)
+        self.bottomFireballCounter = numpy.zeros(count, dtype=numpy.int64)
+
+        # Stage two state
+        self.dragonX = numpy.zeros(count, dtype=numpy.int64)
+        self.dragonDx = numpy.zeros(count, dtype=numpy.int64)
+        self.dragonFacing = numpy.zeros(count, dtype=numpy.int64)
+        self.fireballCooldown = numpy.zeros(count, dtype=numpy.int64)
+        self.treasureX = numpy.zeros((count, TREASURES), dtype=numpy.int64)
+        self.treasureY = numpy.zeros((count, TREASURES), dtype=numpy.int64)
+        self.treasureValue = numpy.zeros((count, TREASURES), dtype=numpy.int64)
+        self.treasureAlive = numpy.zeros((count, TREASURES), dtype=bool)
+        self.treasuresRemaining = numpy.zeros(count, dtype=numpy.int64)
+        self.endPortalVisible = numpy.zeros(count, dtype=bool)
+
+        # Fireballs of every game, with the same layout as a ProjectileArray but a row per game and a flag for the slots in use
+        shape = (count, fireballCap)
+        self.fireballX = numpy.zeros(shape)
+        self.fireballY = numpy.zeros(shape)
+        self.fireballDx = numpy.zeros(shape)
+        self.fireballDy = numpy.zeros(shape)
+        self.fireballEndX = numpy.zeros(shape)
+        self.fireballEndY = numpy.zeros(shape)
+        self.fireballKind = numpy.zeros(shape, dtype=numpy.int64)
+        self.fireballPhase = numpy.zeros(shape, dtype=numpy.int64)
+        self.fireballActive = numpy.zeros(shape, dtype=bool)
+
+        # Metrics
+        self.steps = 0
+        self.episodes = 0
+
+        self.resetGames(numpy.ones(count, dtype=bool))
+
+    def reset(self):
+        '''This method starts every game again and returns their observations.'''
+        self.resetGames(numpy.ones(self.count, dtype=bool))
+        return self.observe()
+
+    def resetGames(self, mask):
+        '''This method starts the games in the mask again from the first stage, the way a new Game does.'''
+        self.lives[mask] = self.startLives
+        self.score[mask] = 0
+        self.level[mask] = self.startLevel
+        self.levelCounter[mask] = 0
+        self.frames[mask] = 0
+        self.held[mask] = 0
+        self.enterStageOne(mask)
+
+    def setAnimation(self, mask, state):
+        '''This method switches the players of the games in the mask to the given animation states, restarting the ones that change, the same as Animation.setState().'''
+        changed = mask & (state != self.animationState)
+        numpy.copyto(self.animationState, state, where=changed)
+        self.animationIndex[changed] = 0
+        self.animationTicks[changed] = 0
+
+    def showFrame(self, mask, frame, anchorLeft):
+        '''This method shows the given frames for the players of the games in the mask. A player whose frame changes size keeps its bottom corner on the anchored side: the left side where anchorLeft is True and the right side elsewhere.'''
+        changed = mask & (frame != self.playerFrame)
+        right = self.x + self.w
+        bottom = self.y + self.h
+        numpy.copyto(self.playerFrame, frame, where=changed)
+        size = self.playerSizes[self.playerFrame]
+        numpy.copyto(self.w, size[:, 0], where=changed)
+        numpy.copyto(self.h, size[:, 1], where=changed)
+        numpy.copyto(self.x, right - self.w, where=changed & numpy.logical_not(anchorLeft))
+        numpy.copyto(self.y, bottom - self.h, where=changed)
+
+    def resetPlayer(self, mask, spawnX, spawnY):
+        '''This method moves the player of the games in the mask so its bottom right corner is just left of the spawn location, the same as Player.reset().'''
+        numpy.copyto(self.x, spawnX - 1 - self.w, where=mask)
+        numpy.copyto(self.y, spawnY - self.h, where=mask)
+
+    def startPlayer(self, mask, spawnX, spawnY):
+        '''This method sets up a new, standing player for the games in the mask at the spawn location.'''
+        self.animationState[mask] = STAND * 2
+        self.animationIndex[mask] = 0
+        self.animationTicks[mask] = 0
+        self.playerFrame[mask] = self.stateFrames[STAND * 2, 0]
+        self.w[mask] = self.playerSizes[self.playerFrame[mask], 0]
+        self.h[mask] = self.playerSizes[self.playerFrame[mask], 1]
+        self.resetPlayer(mask, spawnX, spawnY)
+        self.dx[mask] = 0
+        self.dy[mask] = 0
+        self.facing[mask] = 1
+        self.crouched[mask] = False
+        self.visible[mask] = True
+
+    def enterStageOne(self, mask):
+        '''This method starts the first stage in the games in the mask, raising the level every fourth time.'''
+        self.fireballActive[mask] = False
+        raised = mask & (self.levelCounter == 3)
+        self.level[raised] += 1
+        self.levelCounter[raised] = 0
+        self.levelCounter[mask & ~raised] += 1
+
+        self.stage[mask] = 1
+        self.startPlayer(mask, *STAGE_ONE_START_PORTAL)
+        self.topFireballCounter[mask] = 30
+        self.bottomFireballCounter[mask] = 80
+
+    def enterStageTwo(self, mask):
+        '''This method starts the second stage in the games in the mask, with new treasures.'''
+        self.fireballActive[mask] = False
+        self.stage[mask] = 2
+        self.startPlayer(mask, *STAGE_TWO_START_PORTAL)
+        self.dragonX[mask] = 100
+        self.dragonDx[mask] = 10 + self.level[mask]
+        self.dragonFacing[mask] = 0
+        self.fireballCooldown[mask] = 0
+        self.endPortalVisible[mask] = False
+        self.placeTreasures(mask)
+
+    def placeTreasures(self, mask):
+        '''This method gives the games in the mask new treasures of random values, each in a cell of its own on the occupancy grid with a random offset, the same way the placement module spreads them.'''
+        games = numpy.flatnonzero(mask)
+        if len(games) == 0:
+            return
+        rng = self.rng
+        cellWidth, cellHeight, columns, rows = self.treasureGrid
+        values = rng.integers(1, 6, (len(games), TREASURES))
+        sizes = self.treasureSizes[values]
+
+        # Distinct cells for every game, from a random ordering of all of them
+        cells = numpy.argsort(rng.random((len(games), columns * rows)), axis=1)[:, :TREASURES]
+        area = placement.TREASURE_AREA
+        self.treasureX[games] = area.left + (cells % columns) * cellWidth + rng.integers(0, cellWidth - sizes[:, :, 0] + 1)
+        self.treasureY[games] = area.top + (cells // columns) * cellHeight + rng.integers(0, cellHeight - sizes[:, :, 1] + 1)
+        self.treasureValue[games] = values * 10
+        self.treasureAlive[games] = True
+        self.treasuresRemaining[games] = TREASURES
+
+    def setDirection(self, mask, dx):
+        '''This method has the player of the games in the mask walk with the given speed, facing the way it walks.'''
+        numpy.copyto(self.dx, dx, where=mask)
+        self.facing[mask & (dx < 0)] = 1
+        self.facing[mask & (dx > 0)] = 0
+
+    def toggleCrouch(self, mask):
+        '''This method crouches the standing players of the games in the mask and stands up the crouched ones, the same as Player.toggleCrouch(). The left side of the player stays where it is.'''
+        crouching = mask & ~self.crouched
+        standing = mask & self.crouched
+        state = numpy.where(crouching, CROUCH, STAND) * 2 + (1 - self.facing)
+        self.setAnimation(mask, state)
+        self.showFrame(mask, self.stateFrames[state, 0], True)
+        numpy.copyto(self.y, GROUND - self.h, where=standing)
+        self.dx[mask] = 0
+        self.crouched[crouching] = True
+        self.crouched[standing] = False
+
+    def handleInput(self, actions):
+        '''This method works out the keys pressed and released from the held keys of the last step and applies them the way the stages handle key events. Releases come before presses, in the order a ScriptedInput sends them.'''
+        released = self.held & ~actions
+        pressed = actions & ~self.held
+        self.held[:] = actions
+        one = self.stage == 1
+        two = ~one
+        speed = 8 + self.level
+        leftHeld = (actions & LEFT) != 0
+        rightHeld = (actions & RIGHT) != 0
+        standing = ~self.crouched
+
+        # Released keys
+        up = (released & RIGHT) != 0
+        self.dx[up & one & (self.facing == 0) & standing] = 0
+        self.setDirection(up & two, numpy.where(leftHeld, -speed, 0))
+
+        up = (released & LEFT) != 0
+        self.dx[up & one & (self.facing == 1) & standing] = 0
+        self.setDirection(up & two, numpy.where(rightHeld, speed, 0))
+
+        up = (released & DOWN) != 0
+        self.toggleCrouch(up & one)
+        self.setDirection(up & one & leftHeld & ~self.crouched, -speed)
+        self.setDirection(up & one & rightHeld & ~self.crouched, speed)
+        self.dy[up & two] = 0
+
+        up = (released & UP) != 0
+        self.dy[up & two] = 0
+
+        # Pressed keys
+        down = (pressed & RIGHT) != 0
+        self.setDirection(down & ((one & ~self.crouched) | two), speed)
+
+        down = (pressed & LEFT) != 0
+        hidden = down & ~self.visible
+        self.visible[hidden] = True
+        self.resetPlayer(hidden & one, *STAGE_ONE_START_PORTAL)
+        self.resetPlayer(hidden & two, *STAGE_TWO_START_PORTAL)
+        self.setDirection(down & ((one & ~self.crouched) | two), -speed)
+
+        down = (pressed & DOWN) != 0
+        self.toggleCrouch(down & one)
+        numpy.copyto(self.dy, -speed, where=down & two)
+
+        down = (pressed & UP) != 0
+        self.dy[down & one & (self.y + self.h == GROUND)] = 6
+        numpy.copyto(self.dy, speed, where=down & two)
+
+    def spawn(self, mask, kind, left, bottom, dx, dy, endX, endY):
+        '''This method shoots a fireball in the first free slot of the games in the mask, the same as ProjectileArray.spawn(). Games with every slot in use shoot nothing.'''
+        free = ~self.fireballActive
+        slots = numpy.argmax(free, axis=1)
+        games = numpy.flatnonzero(mask & free[numpy.arange(self.count), slots])
+        if len(games) == 0:
+            return
+        slots = slots[games]
+        self.fireballX[games, slots] = left[games] if numpy.ndim(left) else left
+        self.fireballY[games, slots] = bottom - self.fireballSizes[kind][1]
+        self.fireballDx[games, slots] = dx[games] if numpy.ndim(dx) else dx
+        self.fireballDy[games, slots] = dy[games] if numpy.ndim(dy) else dy
+        self.fireballEndX[games, slots] = endX
+        self.fireballEndY[games, slots] = endY
+        self.fireballKind[games, slots] = kind
+        self.fireballPhase[games, slots] = 0
+        self.fireballActive[games, slots] = True
+
+    def spawnFireballs(self):
+        '''This method shoots fireballs across the drawbridge in the first stage and up from the Dragon in the second, when they are due.'''
+        one = self.stage == 1
+        two = ~one
+        level = self.level
+        portalRight = STAGE_ONE_END_PORTAL[0] + STAGE_ONE_PORTAL_WIDTH
+
+        # Fireballs at head and foot height in the first stage
+        due = one & (self.topFireballCounter >= 60 - level)
+        self.spawn(due, SIDE, portalRight, 280, (550 - portalRight) / 30 + level, 0, 550, -numpy.inf)
+        self.topFireballCounter[due] = 0
+        self.topFireballCounter[one & ~due] += 1
+
+        due = one & (self.bottomFireballCounter >= 110 - level)
+        self.spawn(due, SIDE, portalRight, 305, (550 - portalRight) / 70 + level, 0, 550, -numpy.inf)
+        self.bottomFireballCounter[due] = 0
+        self.bottomFireballCounter[one & ~due] += 1
+
+        # The Dragon shoots upwards when the player is above it in the second stage
+        dragonWidth = self.dragonWidth
+        centerX = self.x + self.w // 2
+        due = two & (centerX > self.dragonX) & (centerX < self.dragonX + dragonWidth) & (self.fireballCooldown == 0)
+        dragonCenter = self.dragonX + dragonWidth // 2
+        self.spawn(due, UP_KIND, numpy.where(self.dragonFacing == 0, dragonCenter + 30, dragonCenter - 70), 380, 0, -7 - level, numpy.inf, 30)
+        self.fireballCooldown[due] = 10
+        self.fireballCooldown[two & (self.fireballCooldown > 0)] -= 1
+
+    def updateSprites(self, mask):
+        '''This method moves the players, Dragons, and fireballs of the games in the mask, the same way their sprites update. Hidden players stay where they are.'''
+        # Players, which can only move within the screen and fall back to the drawbridge in the first stage
+        moving = mask & self.visible
+        x = self.x
+        y = self.y
+        dx = self.dx
+        dy = self.dy
+        lateral = moving & (((x > 0) & (dx < 0)) | ((x + self.w < SCREEN_WIDTH) & (dx > 0)))
+        x[lateral] += dx[lateral]
+        vertical = moving & (((y > CEILING) & (dy > 0)) | ((y + self.h < FLOOR) & (dy < 0)))
+        y[vertical] -= dy[vertical]
+        y[moving & (y < CEILING)] = CEILING
+
+        falling = moving & (self.stage == 1)
+        y[falling] -= dy[falling]
+        dy[falling] -= 1
+        landed = falling & (y + self.h > GROUND)
+        numpy.copyto(y, GROUND - self.h, where=landed)
+        dy[landed] = 0
+
+        # Player animations, which follow what the player is doing
+        kind = numpy.where(self.crouched, CROUCH, numpy.where((dx != 0) | ((self.stage == 2) & (dy != 0)), RUN, STAND))
+        self.setAnimation(moving, kind * 2 + (1 - self.facing))
+        state = self.animationState
+        self.animationTicks[moving] += 1
+        due = moving & (self.animationTicks >= self.stateTicks[state, self.animationIndex])
+        self.animationTicks[due] = 0
+        self.animationIndex[due] = (self.animationIndex[due] + 1) % self.stateLengths[state[due]]
+        self.showFrame(moving, self.stateFrames[state, self.animationIndex], self.facing == 1)
+
+        # Dragons, which turn around at the sides of the screen
+        walking = mask & (self.stage == 2)
+        self.dragonX[walking] += self.dragonDx[walking]
+        turnRight = walking & (self.dragonX <= 0)
+        turnLeft = walking & ~turnRight & (self.dragonX + self.dragonWidth >= SCREEN_WIDTH)
+        self.dragonDx[turnRight | turnLeft] *= -1
+        self.dragonFacing[turnRight] = 0
+        self.dragonFacing[turnLeft] = 1
+
+        # Fireballs, which are removed at the end of their path
+        flying = self.fireballActive & mask[:, None]
+        self.fireballX[flying] = projectileArray.roundRect(self.fireballX[flying] + self.fireballDx[flying])
+        self.fireballY[flying] = projectileArray.roundRect(self.fireballY[flying] + self.fireballDy[flying])
+        self.fireballActive &= ~(flying & ((self.fireballX >= self.fireballEndX) | (self.fireballY <= self.fireballEndY)))
+        self.fireballPhase[flying] += 1
+
+    def narrowPhase(self, hits, images, frames, x, y):
+        '''This method clears the hits in a (game, slot) array whose images, drawn at the given positions, do not overlap the visible pixels of the player. Only the few pairs whose rects overlap are checked against the masks.'''
+        for game, slot in zip(*numpy.nonzero(hits)):
+            image = images[frames[game, slot]]
+            if not collision.masksOverlap(self.playerImages[self.playerFrame[game]], (self.x[game], self.y[game]), image, (x[game, slot], y[game, slot])):
+                hits[game, slot] = False
+
+    def checkCollisions(self):
+        '''This method takes a life for every fireball that hit the player and collects the treasures the player touches.'''
+        left = self.x[:, None]
+        top = self.y[:, None]
+        right = left + self.w[:, None]
+        bottom = top + self.h[:, None]
+
+        # Fireballs that hit the player are removed, and every hit sends the player back to the spawn portal and updates the game again
+        size = self.fireballSizes[self.fireballKind]
+        hits = self.fireballActive & (self.fireballX < right) & (self.fireballX + size[:, :, 0] > left) & (self.fireballY < bottom) & (self.fireballY + size[:, :, 1] > top)
+        self.narrowPhase(hits, self.fireballImages, self.fireballKind * 2 + (self.fireballPhase // projectileArray.FRAME_TICKS) % 2, self.fireballX, self.fireballY)
+        self.fireballActive &= ~hits
+        hitCounts = hits.sum(axis=1)
+        one = self.stage == 1
+        for hit in range(int(hitCounts.max())):
+            dying = (hitCounts > hit) & (self.lives > 0)
+            self.resetPlayer(dying & one, *STAGE_ONE_START_PORTAL)
+            self.resetPlayer(dying & ~one, STAGE_TWO_START_PORTAL[0] + self.portalSize[0], STAGE_TWO_START_PORTAL[1])
+            self.lives[dying] -= 1
+            self.updateSprites(dying)
+
+        # Treasures the player touches in the second stage
+        sizes = self.treasureSizes[self.treasureValue // 10]
+        touched = self.treasureAlive & (self.stage == 2)[:, None] & (self.treasureX < right) & (self.treasureX + sizes[:, :, 0] > left) & (self.treasureY < bottom) & (self.treasureY + sizes[:, :, 1] > top)
+        self.narrowPhase(touched, self.treasureImages, self.treasureValue // 10, self.treasureX, self.treasureY)
+        self.score += (self.treasureValue * touched).sum(axis=1)
+        self.treasuresRemaining -= touched.sum(axis=1)
+        self.treasureAlive &= ~touched
+
+    def touches(self, left, bottom):
+        '''This method returns which players touch a portal whose bottom left corner is at the given location.'''
+        width, height = self.portalSize
+        return (self.x < left + width) & (self.x + self.w > left) & (self.y < bottom) & (self.y + self.h > bottom - height)
+
+    def checkPortals(self):
+        '''This method hides players in the spawn portals and returns which games finished the first stage and which finished the second.'''
+        one = self.stage == 1
+        two = ~one
+
+        # Hide the player in the spawn portal
+        hiding = one & self.visible & (self.x + self.w >= STAGE_ONE_START_PORTAL[0])
+        self.visible[hiding] = False
+        self.y[hiding] = 0
+        hiding = two & self.visible & self.touches(*STAGE_TWO_START_PORTAL)
+        self.visible[hiding] = False
+        self.x[hiding] = 700
+
+        # The end portal of the second stage opens once every treasure is collected
+        self.endPortalVisible |= two & (self.treasuresRemaining == 0)
+        return one & (self.x <= STAGE_ONE_END_PORTAL[0] + STAGE_ONE_PORTAL_WIDTH), two & self.endPortalVisible & self.touches(*STAGE_TWO_END_PORTAL)
+
+    def step(self, actions):
+        '''This method runs one tick of every game with the given array of actions and returns arrays of their observations, rewards, and done flags. Games that are done are started again before their observations are taken.'''
+        actions = numpy.asarray(actions, dtype=numpy.int64)
+        score = self.score.copy()
+        lives = self.lives.copy()
+
+        self.handleInput(actions)
+        self.spawnFireballs()
+        self.checkCollisions()
+        finishedOne, finishedTwo = self.checkPortals()
+        self.updateSprites(numpy.ones(self.count, dtype=bool))
+        self.frames += 1
+
+        rewards = (self.score - score - self.lifePenalty * (lives - self.lives)).astype(numpy.float32)
+        dones = (self.lives == 0) | (self.frames >= self.maxFrames)
+
+        # Move on to the next stage, or start finished games again
+        self.enterStageTwo(finishedOne & ~dones)
+        self.enterStageOne(finishedTwo & ~dones)
+        self.resetGames(dones)
+        self.steps += 1
+        self.episodes += int(dones.sum())
+        return self.observe(), rewards, dones
+
+    def observe(self):
+        '''This method returns the observations of every game as a float32 array with one row of OBSERVATION_SIZE values per game.'''
+        observations = numpy.empty((self.count, OBSERVATION_SIZE), dtype=numpy.float32)
+        fields = (
+            self.stage, self.level, self.lives, self.x, self.y, self.dx, self.dy, self.facing, self.crouched, self.visible,
+            self.topFireballCounter, self.bottomFireballCounter, self.dragonX, self.dragonDx, self.fireballCooldown, self.treasuresRemaining, self.endPortalVisible
+        )
+        for index, values in enumerate(fields):
+            observations[:, index] = values
+        column = len(fields)
+
+        # Nearest fireballs by distance from the player, with zeros where there are fewer
+        relativeX = self.fireballX - self.x[:, None]
+        relativeY = self.fireballY - self.y[:, None]
+        distance = numpy.where(self.fireballActive, numpy.abs(relativeX) + numpy.abs(relativeY), numpy.inf)
+        nearest = numpy.argsort(distance, axis=1)[:, :OBSERVED_FIREBALLS]
+        present = numpy.take_along_axis(self.fireballActive, nearest, axis=1)
+        observations[:, column:column + 3 * OBSERVED_FIREBALLS:3] = numpy.take_along_axis(relativeX, nearest, axis=1) * present
+        observations[:, column + 1:column + 3 * OBSERVED_FIREBALLS:3] = numpy.take_along_axis(relativeY, nearest, axis=1) * present
+        observations[:, column + 2:column + 3 * OBSERVED_FIREBALLS:3] = present
+        column += 3 * OBSERVED_FIREBALLS
+
+        # Treasures, with a value of zero once collected or outside the second stage
+        alive = self.treasureAlive & (self.stage == 2)[:, None]
+        observations[:, column:column + 3 * TREASURES:3] = (self.treasureX - self.x[:, None]) * alive
+        observations[:, column + 1:column + 3 * TREASURES:3] = (self.treasureY - self.y[:, None]) * alive
+        observations[:, column + 2:column + 3 * TREASURES:3] = self.treasureValue * alive
+        return observations
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    environment = VectorEnv(count, seed=0)
+    rng = numpy.random.default_rng(0)
+    environment.reset()
+    start = time.perf_counter()
+    for step in range(steps):
+        environment.step(rng.integers(0, ACTION_COUNT, count))
+    elapsed = time.perf_counter() - start
+    print("%d games for %d steps in %.3f s: %.0f game steps per second, %d games finished" % (count, steps, elapsed, count * steps / elapsed, environment.episodes))